@@ -20,9 +20,15 @@ TABLEAU DE BORD GESTION DES ARCHIVES - VERSION STREAMLIT AMÉLIORÉE
 import streamlit as st
 import sqlite3
 import csv
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta, date
-from io import StringIO
-import pandas as pd
+from functools import lru_cache
+from io import BytesIO, TextIOWrapper
 
 # ============================================================================
 # CONFIGURATION ET CONSTANTES
@@ -35,23 +41,114 @@ class Config:
     SEUIL_OBJECTIF = 0.9  # 90% pour atteindre l'objectif (180 dossiers)
     MOT_DE_PASSE_ADMIN = "archives2025"
     MOT_DE_PASSE_APP = "CNA2025"
-    ARCHIVISTES_DEFAULT = [
+    # Paramètres stockés sous forme d'empreinte PBKDF2 salée, jamais en clair
+    PARAMETRES_SECRETS = ('mot_de_passe', 'mot_de_passe_app')
+    PBKDF2_ITERATIONS = 600_000
+    TENTATIVES_AVANT_DELAI = 3  # échecs de connexion tolérés sans attente
+    DELAI_CONNEXION_MAX = 30  # secondes
+    FENETRE_ECHECS = 900  # secondes sans échec avant l'oubli du compteur d'un client
+    ARCHIVISTES_DEFAULT = (
         "ABDOU DIATTA", "ALPHONSE K DIOUF", "AMINATA NDIAYE",
         "BERNARD B OGUIKI", "FATIM MBAYE", "JOSEPH M N DIOUF",
         "KANI TOURE", "SANOU WAGUE", "SERIGNE B CISS"
-    ]
+    )
+
+# Feuille de style de l'accueil, minifiée une fois pour toutes au chargement
+ACCUEIL_CSS = (
+    ".header-container{background:linear-gradient(135deg,#000000 0%,#2d5016 30%,#ff6b35 70%,#000000 100%);padding:2rem;border-radius:10px;margin-bottom:2rem;box-shadow:0 4px 8px rgba(0,0,0,0.3);text-align:center}"
+    ".header-title{color:white;font-size:2.5rem;font-weight:bold;margin:0;text-shadow:2px 2px 4px rgba(0,0,0,0.8)}"
+    ".header-subtitle{color:#f0f0f0;font-size:1.2rem;margin:0.5rem 0 0 0;text-shadow:1px 1px 2px rgba(0,0,0,0.6)}"
+    ".welcome-text{font-size:1.3rem;font-weight:600;text-align:center;color:#2d5016;margin:1.5rem 0}"
+)
+
+# Entête complet de l'accueil, assemblé une seule fois à l'import
+ACCUEIL_ENTETE_HTML = (
+    f"<style>{ACCUEIL_CSS}</style>"
+    '<div class="header-container">'
+    '<h1 class="header-title">🗃️ Centre National des Archives</h1>'
+    '<p class="header-subtitle">Système de Gestion Documentaire</p>'
+    "</div>"
+    '<p class="welcome-text">🔥 Bienvenue dans le tableau de gestion du traitement physique 🔥</p>'
+)
+
+# Style et titres de la page de connexion
+CONNEXION_HTML = (
+    "<style>.main{display:flex;justify-content:center;align-items:center;height:100vh}"
+    "[data-testid='stMainBlockContainer'],.block-container{max-width:40rem;margin:auto}</style>"
+    "<h1 style='text-align: center;'>🗃️ Centre National des Archives</h1>"
+    "<h3 style='text-align: center;'>Gestion du Traitement Physique</h3>"
+)
+
+# Séparateur de milliers à la française (espace)
+SEPARATEUR_MILLIERS = str.maketrans(",", " ")
+
+def formater_nombre(n):
+    """Entier avec espaces comme séparateurs de milliers : 12345 -> '12 345'"""
+    return format(n, ",d").translate(SEPARATEUR_MILLIERS)
+
+def date_fr(date_iso):
+    """'AAAA-MM-JJ' (format stocké en base) -> 'JJ/MM/AAAA', sans passer par datetime"""
+    return f"{date_iso[8:10]}/{date_iso[5:7]}/{date_iso[:4]}"
+
+# ============================================================================
+# SÉCURITÉ DES MOTS DE PASSE
+# ============================================================================
+
+PREFIXE_EMPREINTE = "pbkdf2_sha256$"
+
+def hacher_mot_de_passe(mot_de_passe):
+    """Empreinte salée au format pbkdf2_sha256$iterations$sel$empreinte"""
+    sel = secrets.token_bytes(16)
+    empreinte = hashlib.pbkdf2_hmac(
+        "sha256", mot_de_passe.encode(), sel, Config.PBKDF2_ITERATIONS
+    )
+    return f"{PREFIXE_EMPREINTE}{Config.PBKDF2_ITERATIONS}${sel.hex()}${empreinte.hex()}"
+
+def est_empreinte(valeur):
+    return bool(valeur) and valeur.startswith(PREFIXE_EMPREINTE)
+
+def verifier_mot_de_passe(mot_de_passe, valeur_stockee):
+    """Compare en temps constant une saisie à la valeur stockée (empreinte ou clair)"""
+    # Refus si la saisie ou la valeur stockée est vide (paramètre absent ou NULL)
+    if not mot_de_passe or not valeur_stockee:
+        return False
+    if not est_empreinte(valeur_stockee):
+        return hmac.compare_digest(mot_de_passe.encode(), valeur_stockee.encode())
+    _, iterations, sel, empreinte = valeur_stockee.split("$")
+    calcul = hashlib.pbkdf2_hmac(
+        "sha256", mot_de_passe.encode(), bytes.fromhex(sel), int(iterations)
+    )
+    return hmac.compare_digest(calcul.hex(), empreinte)
 
 # ============================================================================
 # GESTIONNAIRE DE BASE DE DONNÉES
 # ============================================================================
 
 class DatabaseManager:
+    # Colonnes lues par l'interface (date_creation n'est jamais affichée)
+    COLONNES_TRAITEMENT = "id, date_traitement, archiviste, dossiers_traites, commentaire"
+
     def __init__(self, db_path=Config.DB_PATH):
         self.db_path = db_path
+        # Connexion unique partagée entre les reruns (voir get_db)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-20000")  # ~20 Mo de pages en mémoire
+        self.conn.execute("PRAGMA mmap_size=268435456")  # lectures via mmap (256 Mo max)
+        self._lock = threading.RLock()
         self.init_database()
 
+    @contextmanager
+    def _connexion(self):
+        """Accès exclusif à la connexion partagée (commit/rollback en sortie)"""
+        with self._lock:
+            with self.conn:
+                yield self.conn
+
     def init_database(self):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connexion() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS traitements (
@@ -76,11 +173,73 @@ class DatabaseManager:
                     actif BOOLEAN DEFAULT 1
                 )
             ''')
+            # Index couvrant des agrégats par période : SUM et GROUP BY archiviste
+            # se lisent dans l'index sans revenir à la table
+            cursor.execute("DROP INDEX IF EXISTS idx_trait_date_arch")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_trait_date_arch_dossiers "
+                "ON traitements(date_traitement, archiviste, dossiers_traites)"
+            )
+            # Recherches et suppressions par archiviste, dernière activité
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_trait_arch_date "
+                "ON traitements(archiviste, date_traitement)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_arch_actif ON archivistes(actif, nom)"
+            )
+            # Compteur incrémenté par trigger à chaque écriture sur les données
+            # suivies : sert de jeton de version pour les caches Streamlit
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS compteurs (
+                    nom TEXT PRIMARY KEY,
+                    valeur INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute(
+                "INSERT OR IGNORE INTO compteurs (nom, valeur) VALUES ('version_donnees', 0)"
+            )
+            for table in ('traitements', 'parametres'):
+                for operation in ('INSERT', 'UPDATE', 'DELETE'):
+                    cursor.execute(f'''
+                        CREATE TRIGGER IF NOT EXISTS trg_version_{table}_{operation.lower()}
+                        AFTER {operation} ON {table}
+                        BEGIN
+                            UPDATE compteurs SET valeur = valeur + 1
+                            WHERE nom = 'version_donnees';
+                        END
+                    ''')
+            # Total traité maintenu par trigger (resynchronisé au démarrage) :
+            # les KPIs le lisent sans resommer toute la table
+            cursor.execute(
+                "INSERT OR IGNORE INTO compteurs (nom, valeur) VALUES ('total_dossiers', 0)"
+            )
+            cursor.execute('''
+                UPDATE compteurs
+                SET valeur = (SELECT COALESCE(SUM(dossiers_traites), 0) FROM traitements)
+                WHERE nom = 'total_dossiers'
+            ''')
+            for nom, evenement, delta in (
+                ('insert', 'INSERT', 'NEW.dossiers_traites'),
+                ('delete', 'DELETE', '- OLD.dossiers_traites'),
+                ('update', 'UPDATE OF dossiers_traites', 'NEW.dossiers_traites - OLD.dossiers_traites'),
+            ):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS trg_total_{nom}
+                    AFTER {evenement} ON traitements
+                    BEGIN
+                        UPDATE compteurs SET valeur = valeur + {delta}
+                        WHERE nom = 'total_dossiers';
+                    END
+                ''')
             conn.commit()
             self.init_default_params()
+        # Statistiques pour le planificateur (ANALYZE seulement si utile)
+        with self._connexion() as conn:
+            conn.execute("PRAGMA optimize")
 
     def init_default_params(self):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connexion() as conn:
             cursor = conn.cursor()
             params = [
                 ('stock_initial', str(Config.STOCK_INITIAL)),
@@ -89,11 +248,20 @@ class DatabaseManager:
                 ('mot_de_passe', Config.MOT_DE_PASSE_ADMIN),
                 ('mot_de_passe_app', Config.MOT_DE_PASSE_APP)
             ]
-            for cle, valeur in params:
-                cursor.execute(
-                    "INSERT OR IGNORE INTO parametres (cle, valeur) VALUES (?, ?)",
-                    (cle, valeur)
-                )
+            cursor.executemany(
+                "INSERT OR IGNORE INTO parametres (cle, valeur) VALUES (?, ?)",
+                params
+            )
+            conn.commit()
+            # Migration des mots de passe encore stockés en clair
+            for cle in Config.PARAMETRES_SECRETS:
+                cursor.execute("SELECT valeur FROM parametres WHERE cle = ?", (cle,))
+                valeur = cursor.fetchone()[0]
+                if not est_empreinte(valeur):
+                    cursor.execute(
+                        "UPDATE parametres SET valeur = ? WHERE cle = ?",
+                        (hacher_mot_de_passe(valeur), cle)
+                    )
             conn.commit()
             cursor.execute("SELECT COUNT(*) FROM archivistes")
             count = cursor.fetchone()[0]
@@ -112,11 +280,10 @@ class DatabaseManager:
         nb_updates = cursor.rowcount
 
         cursor.execute("DELETE FROM archivistes")
-        for archiviste in archivistes_cna:
-            cursor.execute(
-                "INSERT INTO archivistes (nom, actif) VALUES (?, 1)",
-                (archiviste,)
-            )
+        cursor.executemany(
+            "INSERT INTO archivistes (nom, actif) VALUES (?, 1)",
+            [(archiviste,) for archiviste in archivistes_cna]
+        )
         if nb_updates > 0:
             cursor.execute(
                 "INSERT INTO archivistes (nom, actif) VALUES (?, 0)",
@@ -124,7 +291,7 @@ class DatabaseManager:
             )
 
     def obtenir_archivistes(self, actifs_seulement=True):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connexion() as conn:
             cursor = conn.cursor()
             if actifs_seulement:
                 cursor.execute(
@@ -138,53 +305,80 @@ class DatabaseManager:
                 return cursor.fetchall()
 
     def ajouter_archiviste(self, nom):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connexion() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO archivistes (nom, actif) VALUES (?, 1)",
                 (nom,)
             )
             conn.commit()
+        _cached_archivistes.clear()
+        _cached_archivistes_activite.clear()
 
     def desactiver_archiviste(self, nom):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connexion() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "UPDATE archivistes SET actif = 0 WHERE nom = ?",
                 (nom,)
             )
             conn.commit()
+        _cached_archivistes.clear()
+        _cached_archivistes_activite.clear()
 
-    def supprimer_archiviste(self, nom):
-        with sqlite3.connect(self.db_path) as conn:
+    def reactiver_archiviste(self, nom):
+        with self._connexion() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "DELETE FROM archivistes WHERE nom = ?",
+                "UPDATE archivistes SET actif = 1 WHERE nom = ?",
                 (nom,)
             )
             conn.commit()
+        _cached_archivistes.clear()
+        _cached_archivistes_activite.clear()
 
-    def obtenir_parametre(self, cle):
-        with sqlite3.connect(self.db_path) as conn:
+    def supprimer_archiviste(self, nom):
+        with self._connexion() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT valeur FROM parametres WHERE cle = ?",
-                (cle,)
+                "DELETE FROM archivistes WHERE nom = ?",
+                (nom,)
             )
-            row = cursor.fetchone()
-            return row[0] if row else None
+            conn.commit()
+        _cached_archivistes.clear()
+        _cached_archivistes_activite.clear()
+
+    def obtenir_parametres(self):
+        """Dictionnaire cle -> valeur de tous les paramètres"""
+        with self._connexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT cle, valeur FROM parametres")
+            return dict(cursor.fetchall())
 
     def mettre_a_jour_parametre(self, cle, valeur):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connexion() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT OR REPLACE INTO parametres (cle, valeur) VALUES (?, ?)",
                 (cle, valeur)
             )
             conn.commit()
+        _cached_parametres.clear()
+
+    def definir_mot_de_passe(self, cle, mot_de_passe):
+        """Enregistre l'empreinte salée d'un mot de passe"""
+        self.mettre_a_jour_parametre(cle, hacher_mot_de_passe(mot_de_passe))
+
+    @staticmethod
+    def _normaliser_date(valeur):
+        """Date au format stocké 'AAAA-MM-JJ' ; ValueError si elle n'est pas valide"""
+        if isinstance(valeur, date):
+            return valeur.strftime('%Y-%m-%d')
+        return date.fromisoformat(valeur).isoformat()
 
     def ajouter_traitement(self, date_traitement, archiviste, dossiers_traites, commentaire=""):
-        with sqlite3.connect(self.db_path) as conn:
+        date_traitement = self._normaliser_date(date_traitement)
+        with self._connexion() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO traitements (date_traitement, archiviste, dossiers_traites, commentaire)
@@ -193,10 +387,44 @@ class DatabaseManager:
             conn.commit()
             return cursor.lastrowid
 
+    def ajouter_traitements(self, saisies):
+        """Insère plusieurs saisies (date, archiviste, dossiers, commentaire) en une transaction"""
+        saisies = [(self._normaliser_date(d), *reste) for d, *reste in saisies]
+        with self._connexion() as conn:
+            conn.executemany('''
+                INSERT INTO traitements (date_traitement, archiviste, dossiers_traites, commentaire)
+                VALUES (?, ?, ?, ?)
+            ''', saisies)
+            conn.commit()
+
+    def modifier_traitement(self, id_traitement, date_traitement, archiviste, dossiers_traites, commentaire=""):
+        date_traitement = self._normaliser_date(date_traitement)
+        with self._connexion() as conn:
+            conn.execute('''
+                UPDATE traitements
+                SET date_traitement = ?, archiviste = ?, dossiers_traites = ?, commentaire = ?
+                WHERE id = ?
+            ''', (date_traitement, archiviste, dossiers_traites, commentaire, id_traitement))
+
+    def supprimer_traitement(self, id_traitement):
+        with self._connexion() as conn:
+            conn.execute("DELETE FROM traitements WHERE id = ?", (id_traitement,))
+
+    def supprimer_traitements_par_date(self, date_traitement):
+        """Supprime toutes les saisies d'une date, retourne le nombre supprimé"""
+        with self._connexion() as conn:
+            return conn.execute("DELETE FROM traitements WHERE date_traitement = ?", (date_traitement,)).rowcount
+
+    def supprimer_traitements_par_archiviste(self, archiviste):
+        """Supprime toutes les saisies d'un archiviste, retourne le nombre supprimé"""
+        with self._connexion() as conn:
+            return conn.execute("DELETE FROM traitements WHERE archiviste = ?", (archiviste,)).rowcount
+
     def obtenir_traitements(self, date_debut=None, date_fin=None):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connexion() as conn:
             cursor = conn.cursor()
-            query = "SELECT * FROM traitements WHERE 1=1"
+            cursor.row_factory = sqlite3.Row
+            query = f"SELECT {self.COLONNES_TRAITEMENT} FROM traitements WHERE 1=1"
             params = []
             if date_debut:
                 query += " AND date_traitement >= ?"
@@ -204,17 +432,16 @@ class DatabaseManager:
             if date_fin:
                 query += " AND date_traitement <= ?"
                 params.append(date_fin)
-            query += " ORDER BY date_traitement DESC"
+            query += " ORDER BY date_traitement DESC, id"
             cursor.execute(query, params)
-            cols = [d[0] for d in cursor.description]
-            rows = cursor.fetchall()
-            return [dict(zip(cols, row)) for row in rows]
+            return cursor.fetchall()
 
     def obtenir_traitements_par_archiviste(self, archiviste, date_debut=None, date_fin=None):
         """Obtenir les traitements d'un archiviste spécifique"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connexion() as conn:
             cursor = conn.cursor()
-            query = "SELECT * FROM traitements WHERE archiviste = ?"
+            cursor.row_factory = sqlite3.Row
+            query = f"SELECT {self.COLONNES_TRAITEMENT} FROM traitements WHERE archiviste = ?"
             params = [archiviste]
             if date_debut:
                 query += " AND date_traitement >= ?"
@@ -222,14 +449,111 @@ class DatabaseManager:
             if date_fin:
                 query += " AND date_traitement <= ?"
                 params.append(date_fin)
-            query += " ORDER BY date_traitement DESC"
+            query += " ORDER BY date_traitement DESC, id"
             cursor.execute(query, params)
-            cols = [d[0] for d in cursor.description]
-            rows = cursor.fetchall()
-            return [dict(zip(cols, row)) for row in rows]
+            return cursor.fetchall()
+
+    def somme_dossiers(self, date_debut=None, date_fin=None):
+        """Total des dossiers traités sur l'intervalle (agrégé par SQLite)"""
+        with self._connexion() as conn:
+            cursor = conn.cursor()
+            query = "SELECT COALESCE(SUM(dossiers_traites), 0) FROM traitements WHERE 1=1"
+            params = []
+            if date_debut:
+                query += " AND date_traitement >= ?"
+                params.append(date_debut)
+            if date_fin:
+                query += " AND date_traitement <= ?"
+                params.append(date_fin)
+            cursor.execute(query, params)
+            return cursor.fetchone()[0]
+
+    def compter_jours_saisis(self):
+        """Nombre de dates distinctes ayant au moins une saisie"""
+        with self._connexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(DISTINCT date_traitement) FROM traitements")
+            return cursor.fetchone()[0]
+
+    def obtenir_totaux_kpis(self):
+        """Stock initial et total traité en une seule requête"""
+        with self._connexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    (SELECT valeur FROM parametres WHERE cle = 'stock_initial'),
+                    (SELECT valeur FROM compteurs WHERE nom = 'total_dossiers')
+            """)
+            return cursor.fetchone()
+
+    def stats_par_archiviste(self, date_debut=None, date_fin=None):
+        """Total de dossiers et jours ouvrés distincts par archiviste"""
+        with self._connexion() as conn:
+            cursor = conn.cursor()
+            query = """
+                SELECT archiviste,
+                       SUM(dossiers_traites),
+                       COUNT(DISTINCT CASE
+                           WHEN strftime('%w', date_traitement) NOT IN ('0', '6')
+                           THEN date_traitement
+                       END)
+                FROM traitements WHERE 1=1
+            """
+            params = []
+            if date_debut:
+                query += " AND date_traitement >= ?"
+                params.append(date_debut)
+            if date_fin:
+                query += " AND date_traitement <= ?"
+                params.append(date_fin)
+            query += " GROUP BY archiviste ORDER BY MAX(date_traitement) DESC, archiviste"
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def stats_par_archiviste_par_annee(self):
+        """Mêmes agrégats que stats_par_archiviste, pour toutes les années en une requête"""
+        with self._connexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT CAST(substr(date_traitement, 1, 4) AS INTEGER) AS annee,
+                       archiviste,
+                       SUM(dossiers_traites),
+                       COUNT(DISTINCT CASE
+                           WHEN strftime('%w', date_traitement) NOT IN ('0', '6')
+                           THEN date_traitement
+                       END)
+                FROM traitements
+                GROUP BY annee, archiviste
+                ORDER BY annee, MAX(date_traitement) DESC, archiviste
+            """)
+            par_annee = {}
+            for annee, arch, total, jours in cursor.fetchall():
+                par_annee.setdefault(annee, []).append((arch, total, jours))
+            return par_annee
+
+    def obtenir_archivistes_avec_activite(self):
+        """(nom, actif, date de dernière saisie ou None) de tous les archivistes"""
+        with self._connexion() as conn:
+            cursor = conn.cursor()
+            # MAX corrélé : une descente dans idx_trait_arch_date par archiviste
+            cursor.execute('''
+                SELECT a.nom, a.actif,
+                       (SELECT MAX(t.date_traitement) FROM traitements t
+                        WHERE t.archiviste = a.nom)
+                FROM archivistes a
+                ORDER BY a.actif DESC, a.nom
+            ''')
+            return cursor.fetchall()
+
+    def obtenir_version(self):
+        """Jeton de version des traitements et paramètres (maintenu par trigger)"""
+        with self._connexion() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT valeur FROM compteurs WHERE nom = 'version_donnees'")
+            return cursor.fetchone()[0]
 
     def reinitialiser_donnees(self):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connexion() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM traitements")
             conn.commit()
@@ -242,42 +566,35 @@ class StatisticsCalculator:
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
 
-    def _jours_ouvres(self, dates_list):
-        jours = set()
-        for d_str in dates_list:
-            try:
-                d = datetime.strptime(d_str, "%Y-%m-%d").date()
-                if d.weekday() < 5:
-                    jours.add(d)
-            except:
-                continue
-        return len(jours)
-
-    def _calculer_jours_ouvres_annee(self, annee):
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _calculer_jours_ouvres_annee(annee):
         """Calcule le nombre total de jours ouvrés dans une année"""
         debut = date(annee, 1, 1)
-        fin = date(annee, 12, 31)
-        
-        current = debut
-        jours_ouvres = 0
-        while current <= fin:
-            if current.weekday() < 5:  # Lundi=0 à Vendredi=4
-                jours_ouvres += 1
-            current += timedelta(days=1)
-        
-        return jours_ouvres
+        nb_jours = (date(annee + 1, 1, 1) - debut).days
+        semaines, reste = divmod(nb_jours, 7)
+        # Semaines complètes (5 jours ouvrés) + jours restants hors weekend
+        return semaines * 5 + sum(
+            1 for i in range(reste) if (debut.weekday() + i) % 7 < 5  # Lundi=0 à Vendredi=4
+        )
+
+    @staticmethod
+    def calculer_taux(valeur, seuil, objectif):
+        """Taux (échelle jusqu'à 90% sous le seuil) et indicateur d'atteinte du seuil"""
+        if valeur >= seuil:
+            return (valeur / objectif) * 100, True  # Peut dépasser 100%
+        return (valeur / seuil) * 90, False
 
     def calculer_kpis_globaux(self):
-        traitements = self.db.obtenir_traitements()
-        stock_initial = int(self.db.obtenir_parametre('stock_initial') or 0)
-        if not traitements:
+        stock_initial, total = self.db.obtenir_totaux_kpis()
+        stock_initial = int(stock_initial or 0)
+        if not total:
             return {
                 'stock_initial': stock_initial,
                 'dossiers_traites': 0,
                 'stock_restant': stock_initial,
                 'pourcentage_traite': 0.0
             }
-        total = sum(t['dossiers_traites'] for t in traitements)
         restant = max(0, stock_initial - total)
         pct = (total / stock_initial) * 100 if stock_initial > 0 else 0
         return {
@@ -291,13 +608,13 @@ class StatisticsCalculator:
         """Calcul avec logique des 90%"""
         if date_ref is None:
             date_ref = date.today()
-        date_str = date_ref.strftime('%Y-%m-%d')
-        traitements = self.db.obtenir_traitements(date_str, date_str)
-        objectif = int(self.db.obtenir_parametre('objectif_journalier') or 200)
-        seuil_objectif = float(self.db.obtenir_parametre('seuil_objectif') or 0.9)
+        date_str = date_ref.isoformat()
+        total = self.db.somme_dossiers(date_str, date_str)
+        objectif = int(_cached_param(self.db, 'objectif_journalier') or 200)
+        seuil_objectif = float(_cached_param(self.db, 'seuil_objectif') or 0.9)
         seuil_reussite = objectif * seuil_objectif  # 90% de l'objectif = réussite
         
-        if not traitements:
+        if not total:
             return {
                 'date': date_ref,
                 'dossiers_traites': 0,
@@ -308,15 +625,8 @@ class StatisticsCalculator:
                 'ecart': -int(seuil_reussite)
             }
         
-        total = sum(t['dossiers_traites'] for t in traitements)
-        
         # Calcul : on considère 100% à partir de 90% de l'objectif
-        if total >= seuil_reussite:
-            taux = (total / objectif) * 100  # Peut dépasser 100%
-            objectif_atteint = True
-        else:
-            taux = (total / seuil_reussite) * 90  # Échelle jusqu'à 90%
-            objectif_atteint = False
+        taux, objectif_atteint = self.calculer_taux(total, seuil_reussite, objectif)
         
         ecart = total - seuil_reussite
         
@@ -336,16 +646,16 @@ class StatisticsCalculator:
             date_ref = date.today()
         debut_semaine = date_ref - timedelta(days=date_ref.weekday())
         fin_semaine = debut_semaine + timedelta(days=6)
-        traitements = self.db.obtenir_traitements(
-            debut_semaine.strftime('%Y-%m-%d'),
-            fin_semaine.strftime('%Y-%m-%d')
+        total = self.db.somme_dossiers(
+            debut_semaine.isoformat(),
+            fin_semaine.isoformat()
         )
-        objectif_journalier = int(self.db.obtenir_parametre('objectif_journalier') or 200)
-        seuil_objectif = float(self.db.obtenir_parametre('seuil_objectif') or 0.9)
+        objectif_journalier = int(_cached_param(self.db, 'objectif_journalier') or 200)
+        seuil_objectif = float(_cached_param(self.db, 'seuil_objectif') or 0.9)
         objectif_hebdo = objectif_journalier * 5  # 5 jours ouvrés
         seuil_hebdo = objectif_hebdo * seuil_objectif  # 90% de l'objectif hebdo
         
-        if not traitements:
+        if not total:
             return {
                 'semaine': f"{debut_semaine.strftime('%d/%m')} - {fin_semaine.strftime('%d/%m/%Y')}",
                 'dossiers_traites': 0,
@@ -355,15 +665,8 @@ class StatisticsCalculator:
                 'objectif_atteint': False
             }
         
-        total = sum(t['dossiers_traites'] for t in traitements)
-        
         # Même logique que journalier
-        if total >= seuil_hebdo:
-            taux = (total / objectif_hebdo) * 100  # Peut dépasser 100%
-            objectif_atteint = True
-        else:
-            taux = (total / seuil_hebdo) * 90
-            objectif_atteint = False
+        taux, objectif_atteint = self.calculer_taux(total, seuil_hebdo, objectif_hebdo)
         
         return {
             'semaine': f"{debut_semaine.strftime('%d/%m')} - {fin_semaine.strftime('%d/%m/%Y')}",
@@ -380,40 +683,28 @@ class StatisticsCalculator:
             date_ref = date.today()
         debut_semaine = date_ref - timedelta(days=date_ref.weekday())
         fin_semaine = debut_semaine + timedelta(days=6)
-        traitements = self.db.obtenir_traitements(
-            debut_semaine.strftime('%Y-%m-%d'),
-            fin_semaine.strftime('%Y-%m-%d')
+        stats = self.db.stats_par_archiviste(
+            debut_semaine.isoformat(),
+            fin_semaine.isoformat()
         )
-        if not traitements:
+        if not stats:
             return []
-            
-        stats = {}
-        for t in traitements:
-            arch = t['archiviste']
-            stats.setdefault(arch, []).append(t['date_traitement'])
         
         result = []
-        objectif_journalier = int(self.db.obtenir_parametre('objectif_journalier') or 200)
-        seuil_objectif = float(self.db.obtenir_parametre('seuil_objectif') or 0.9)
+        objectif_journalier = int(_cached_param(self.db, 'objectif_journalier') or 200)
+        seuil_objectif = float(_cached_param(self.db, 'seuil_objectif') or 0.9)
         objectif_hebdo = objectif_journalier * 5
         seuil_hebdo = objectif_hebdo * seuil_objectif
         
-        for arch, dates in stats.items():
-            total = sum(
-                t['dossiers_traites'] for t in traitements if t['archiviste'] == arch
-            )
-            jours_ouvres = self._jours_ouvres(dates)
-            
+        for arch, total, jours_ouvres in stats:
             # Calculer le taux selon la nouvelle logique
-            if total >= seuil_hebdo:
-                taux = (total / objectif_hebdo) * 100  # Peut dépasser 100%
+            taux, atteint = self.calculer_taux(total, seuil_hebdo, objectif_hebdo)
+            if atteint:
                 statut = "🟢 Objectif atteint"
+            elif taux >= 80:
+                statut = "🟡 Proche objectif"
             else:
-                taux = (total / seuil_hebdo) * 90
-                if taux >= 80:
-                    statut = "🟡 Proche objectif"
-                else:
-                    statut = "🔴 En retard"
+                statut = "🔴 En retard"
             
             moy = (total / jours_ouvres) if jours_ouvres > 0 else 0
             
@@ -435,40 +726,29 @@ class StatisticsCalculator:
         """Calcul avec logique des 90%"""
         date_fin = date.today()
         date_debut = date_fin - timedelta(days=30)
-        traitements = self.db.obtenir_traitements(
-            date_debut.strftime('%Y-%m-%d'),
-            date_fin.strftime('%Y-%m-%d')
+        stats = self.db.stats_par_archiviste(
+            date_debut.isoformat(),
+            date_fin.isoformat()
         )
-        if not traitements:
+        if not stats:
             return []
-            
-        stats = {}
-        for t in traitements:
-            arch = t['archiviste']
-            stats.setdefault(arch, []).append(t['date_traitement'])
         
         result = []
-        objectif = int(self.db.obtenir_parametre('objectif_journalier') or 200)
-        seuil_objectif = float(self.db.obtenir_parametre('seuil_objectif') or 0.9)
+        objectif = int(_cached_param(self.db, 'objectif_journalier') or 200)
+        seuil_objectif = float(_cached_param(self.db, 'seuil_objectif') or 0.9)
         seuil_journalier = objectif * seuil_objectif  # 180 dossiers pour atteindre l'objectif
         
-        for arch, dates in stats.items():
-            total = sum(
-                t['dossiers_traites'] for t in traitements if t['archiviste'] == arch
-            )
-            jours_ouvres = self._jours_ouvres(dates)
+        for arch, total, jours_ouvres in stats:
             moy = (total / jours_ouvres) if jours_ouvres > 0 else 0
             
             # Calculer selon la nouvelle logique
-            if moy >= seuil_journalier:
-                taux_obj = (moy / objectif) * 100  # Peut dépasser 100%
+            taux_obj, atteint = self.calculer_taux(moy, seuil_journalier, objectif)
+            if atteint:
                 statut = "🟢 Objectif atteint"
+            elif taux_obj >= 80:
+                statut = "🟡 Proche objectif"
             else:
-                taux_obj = (moy / seuil_journalier) * 90
-                if taux_obj >= 80:
-                    statut = "🟡 Proche objectif"
-                else:
-                    statut = "🔴 En retard"
+                statut = "🔴 En retard"
             
             result.append({
                 'archiviste': arch,
@@ -487,49 +767,32 @@ class StatisticsCalculator:
         if annee is None:
             annee = date.today().year
         
-        date_debut = date(annee, 1, 1)
-        date_fin = date(annee, 12, 31)
-        
-        traitements = self.db.obtenir_traitements(
-            date_debut.strftime('%Y-%m-%d'),
-            date_fin.strftime('%Y-%m-%d')
-        )
+        # Toutes les années sont agrégées d'un coup : changer d'année ne relance pas SQLite
+        stats = _cached_stats_annuelles(self.db, self.db.obtenir_version()).get(annee)
         
-        if not traitements:
+        if not stats:
             return []
         
-        stats = {}
-        for t in traitements:
-            arch = t['archiviste']
-            stats.setdefault(arch, []).append(t['date_traitement'])
-        
         result = []
-        objectif_journalier = int(self.db.obtenir_parametre('objectif_journalier') or 200)
-        seuil_objectif = float(self.db.obtenir_parametre('seuil_objectif') or 0.9)
+        objectif_journalier = int(_cached_param(self.db, 'objectif_journalier') or 200)
+        seuil_objectif = float(_cached_param(self.db, 'seuil_objectif') or 0.9)
         seuil_journalier = objectif_journalier * seuil_objectif  # 180 dossiers
+        jours_ouvres_annee = self._calculer_jours_ouvres_annee(annee)
         
-        for arch, dates in stats.items():
-            total = sum(
-                t['dossiers_traites'] for t in traitements if t['archiviste'] == arch
-            )
-            
-            jours_ouvres = self._jours_ouvres(dates)
+        for arch, total, jours_ouvres in stats:
             moyenne_jour = (total / jours_ouvres) if jours_ouvres > 0 else 0
             
             # Calculer selon la nouvelle logique
-            if moyenne_jour >= seuil_journalier:
-                taux_objectif = (moyenne_jour / objectif_journalier) * 100  # Peut dépasser 100%
+            taux_objectif, atteint = self.calculer_taux(moyenne_jour, seuil_journalier, objectif_journalier)
+            if atteint:
                 statut = "🟢 Excellent"
+            elif taux_objectif >= 80:
+                statut = "🟡 Correct"
+            elif taux_objectif >= 60:
+                statut = "🟠 Moyen"
             else:
-                taux_objectif = (moyenne_jour / seuil_journalier) * 90
-                if taux_objectif >= 80:
-                    statut = "🟡 Correct"
-                elif taux_objectif >= 60:
-                    statut = "🟠 Moyen"
-                else:
-                    statut = "🔴 Insuffisant"
+                statut = "🔴 Insuffisant"
             
-            jours_ouvres_annee = self._calculer_jours_ouvres_annee(annee)
             couverture_annee = (jours_ouvres / jours_ouvres_annee) * 100 if jours_ouvres_annee > 0 else 0
             
             result.append({
@@ -547,62 +810,220 @@ class StatisticsCalculator:
         result.sort(key=lambda x: x['taux_objectif'], reverse=True)
         return result
 
+# ============================================================================
+# CACHE DES CALCULS
+# ============================================================================
+
+@st.cache_resource
+def get_db() -> DatabaseManager:
+    """Gestionnaire de base unique pour toutes les sessions"""
+    return DatabaseManager()
+
+@st.cache_resource
+def get_stats_calc() -> StatisticsCalculator:
+    """Calculateur de statistiques partagé, lié à la base de get_db()"""
+    return StatisticsCalculator(get_db())
+
+@st.cache_resource
+def _etat_connexions():
+    """Échecs de connexion côté serveur, par client : {cle: {echecs, dernier_echec, bloque_jusqua}}"""
+    return {'clients': {}, 'verrou': threading.Lock()}
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_parametres(_db: DatabaseManager):
+    """Tous les paramètres en une requête (invalidé par mettre_a_jour_parametre)"""
+    return _db.obtenir_parametres()
+
+def _cached_param(_db: DatabaseManager, cle):
+    """Valeur d'un paramètre lue dans le dictionnaire mis en cache"""
+    return _cached_parametres(_db).get(cle)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_archivistes(_db: DatabaseManager, actifs_seulement=True):
+    """Liste des archivistes mise en cache (invalidée à chaque modification)"""
+    return _db.obtenir_archivistes(actifs_seulement)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_archivistes_activite(_db: DatabaseManager, version):
+    """Archivistes et dernière saisie (vidé aussi à chaque modification d'archiviste)"""
+    return _db.obtenir_archivistes_avec_activite()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_kpis(_stats_calc: StatisticsCalculator, version):
+    """KPIs globaux mis en cache, invalidés par le jeton de version des données"""
+    return _stats_calc.calculer_kpis_globaux()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_perf_jour(_stats_calc: StatisticsCalculator, version, jour):
+    return _stats_calc.calculer_performances_journalieres(jour)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_perf_semaine(_stats_calc: StatisticsCalculator, version, jour):
+    return _stats_calc.calculer_performances_hebdomadaires(jour)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_somme_dossiers(_db: DatabaseManager, version, date_debut=None, date_fin=None):
+    return _db.somme_dossiers(date_debut, date_fin)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_traitements(_db: DatabaseManager, version, date_debut=None, date_fin=None, archiviste=None):
+    """Saisies de l'intervalle (d'un archiviste si précisé), en dict pour être sérialisables"""
+    if archiviste:
+        lignes = _db.obtenir_traitements_par_archiviste(archiviste, date_debut, date_fin)
+    else:
+        lignes = _db.obtenir_traitements(date_debut, date_fin)
+    return [dict(t) for t in lignes]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_perf_hebdo(_stats_calc: StatisticsCalculator, version, date_ref):
+    return _stats_calc.obtenir_performances_hebdo_par_archiviste(date_ref)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_perf_30j(_stats_calc: StatisticsCalculator, version, jour):
+    """jour (date du calcul) fait partie de la clé : la fenêtre glisse chaque jour"""
+    return _stats_calc.obtenir_performances_30j_par_archiviste()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_stats_annuelles(_db: DatabaseManager, version):
+    return _db.stats_par_archiviste_par_annee()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_perf_annuelles(_stats_calc: StatisticsCalculator, version, annee):
+    return _stats_calc.obtenir_performances_annuelles_par_archiviste(annee)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_tableau_annuel(_stats_calc: StatisticsCalculator, version, annee):
+    """Tableau de classement annuel prêt à afficher"""
+    import pandas as pd
+    stats_annee = _cached_perf_annuelles(_stats_calc, version, annee)
+    return pd.DataFrame({
+        "Rang": [f"#{i}" for i in range(1, len(stats_annee) + 1)],
+        "Archiviste": [stat['archiviste'] for stat in stats_annee],
+        "Total dossiers": [formater_nombre(stat['total_dossiers']) for stat in stats_annee],
+        "Jours travaillés": [stat['jours_travailles'] for stat in stats_annee],
+        "Moyenne/jour": [stat['moyenne_jour'] for stat in stats_annee],
+        "% Performance": [f"{stat['taux_objectif']}%" for stat in stats_annee],
+        "Seuil (90%)": [stat['seuil_journalier'] for stat in stats_annee],
+        "% Couverture année": [f"{stat['couverture_annee']}%" for stat in stats_annee],
+        "Statut": [stat['statut'] for stat in stats_annee]
+    })
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_csv_annuel(_stats_calc: StatisticsCalculator, version, annee):
+    """Export CSV du classement annuel (octets utf-8-sig)"""
+    stats_annee = _cached_perf_annuelles(_stats_calc, version, annee)
+    # Total brut (sans séparateur de milliers) pour le tableur
+    df_export = _cached_tableau_annuel(_stats_calc, version, annee).assign(
+        **{"Total dossiers": [stat['total_dossiers'] for stat in stats_annee]}
+    )
+    return df_export.to_csv(
+        index=False,
+        header=[
+            "Rang", "Archiviste", "Total_dossiers", "Jours_travailles", 
+            "Moyenne_jour", "Taux_performance", "Seuil_90", "Couverture_annee", "Statut"
+        ],
+        lineterminator="\r\n"
+    ).encode("utf-8-sig")
+
 # ============================================================================
 # FONCTION D'AUTHENTIFICATION GLOBALE
 # ============================================================================
 
+def est_authentifie():
+    """Chemin rapide : simple lecture du drapeau de session"""
+    return st.session_state.get('authenticated', False)
+
+def identifiant_client():
+    """Adresse IP du client si Streamlit la fournit, sinon identifiant propre à la session"""
+    ip = getattr(getattr(st, "context", None), "ip_address", None)
+    if ip:
+        return ip
+    return st.session_state.setdefault('id_client', secrets.token_hex(8))
+
+def attente_connexion(cle_client):
+    """Secondes pendant lesquelles ce client est encore bloqué (0 si aucune)"""
+    etat = _etat_connexions()
+    maintenant = time.monotonic()
+    with etat['verrou']:
+        client = etat['clients'].get(cle_client)
+        if client is None:
+            return 0
+        if maintenant - client['dernier_echec'] > Config.FENETRE_ECHECS:
+            del etat['clients'][cle_client]
+            return 0
+        return max(0, client['bloque_jusqua'] - maintenant)
+
+def enregistrer_echec_connexion(cle_client):
+    """Compte un échec et, au-delà du seuil, bloque ce client seul (délai exponentiel)"""
+    etat = _etat_connexions()
+    maintenant = time.monotonic()
+    with etat['verrou']:
+        clients = etat['clients']
+        # Oubli des clients sans échec récent : la table reste bornée
+        for cle in [c for c, v in clients.items()
+                    if maintenant - v['dernier_echec'] > Config.FENETRE_ECHECS]:
+            del clients[cle]
+        client = clients.setdefault(
+            cle_client, {'echecs': 0, 'dernier_echec': 0.0, 'bloque_jusqua': 0.0}
+        )
+        client['echecs'] += 1
+        client['dernier_echec'] = maintenant
+        if client['echecs'] >= Config.TENTATIVES_AVANT_DELAI:
+            client['bloque_jusqua'] = maintenant + min(
+                2 ** client['echecs'], Config.DELAI_CONNEXION_MAX
+            )
+
+def reinitialiser_echecs_connexion(cle_client):
+    etat = _etat_connexions()
+    with etat['verrou']:
+        etat['clients'].pop(cle_client, None)
+
+@st.fragment
+def formulaire_connexion(db: DatabaseManager):
+    """Formulaire de connexion, réexécuté seul lors d'une soumission"""
+    with st.form("login_form"):
+        password = st.text_input("Mot de passe", type="password", placeholder="Entrez le mot de passe")
+        submit = st.form_submit_button("Se connecter", use_container_width=True)
+        
+        if submit:
+            # Anti force brute : après plusieurs échecs d'un même client (compté côté
+            # serveur, un nouvel onglet ne remet donc pas le compteur à zéro), ses
+            # tentatives sont refusées d'emblée pendant un délai exponentiel, sans
+            # PBKDF2 ni sleep ; les autres clients ne sont pas concernés
+            cle_client = identifiant_client()
+            attente = attente_connexion(cle_client)
+            if attente > 0:
+                st.error(f"⏳ Trop de tentatives échouées, réessayez dans {int(attente) + 1} s.")
+                return
+            # Le mot de passe attendu n'est lu qu'à la soumission
+            mot_de_passe_app = _cached_param(db, 'mot_de_passe_app')
+            if verifier_mot_de_passe(password, mot_de_passe_app):
+                reinitialiser_echecs_connexion(cle_client)
+                st.session_state.authenticated = True
+                # Relance complète (hors fragment) pour afficher l'application
+                st.rerun(scope="app")
+            else:
+                enregistrer_echec_connexion(cle_client)
+                st.error("❌ Mot de passe incorrect")
+
 def check_authentication(db: DatabaseManager):
     """Vérifie si l'utilisateur est authentifié pour accéder à l'application"""
     
-    # Initialiser l'état de session si nécessaire
-    if 'authenticated' not in st.session_state:
-        st.session_state.authenticated = False
-    
     # Si déjà authentifié, retourner True
-    if st.session_state.authenticated:
+    if est_authentifie():
         return True
     
-    # Sinon, afficher le formulaire de connexion
-    st.markdown("""
-    <style>
-    .main {
-        display: flex;
-        justify-content: center;
-        align-items: center;
-        height: 100vh;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Sinon, afficher le formulaire de connexion : style et titre centré en un seul bloc
+    st.html(CONNEXION_HTML)
     
-    # Titre centré
-    st.markdown("<h1 style='text-align: center;'>🗃️ Centre National des Archives</h1>", unsafe_allow_html=True)
-    st.markdown("<h3 style='text-align: center;'>Gestion du Traitement Physique</h3>", unsafe_allow_html=True)
+    # Le formulaire est centré par la feuille de style (largeur du conteneur limitée)
+    st.markdown("---\n\n### 🔐 Authentification requise")
     
-    # Créer un conteneur centré pour le formulaire
-    col1, col2, col3 = st.columns([1, 2, 1])
+    # Formulaire de connexion
+    formulaire_connexion(db)
     
-    with col2:
-        st.markdown("---")
-        st.markdown("### 🔐 Authentification requise")
-        
-        # Récupérer le mot de passe de l'application depuis la base de données
-        mot_de_passe_app = db.obtenir_parametre('mot_de_passe_app')
-        
-        # Formulaire de connexion
-        with st.form("login_form"):
-            password = st.text_input("Mot de passe", type="password", placeholder="Entrez le mot de passe")
-            submit = st.form_submit_button("Se connecter", use_container_width=True)
-            
-            if submit:
-                if password == mot_de_passe_app:
-                    st.session_state.authenticated = True
-                    st.success("✅ Connexion réussie!")
-                    st.rerun()
-                else:
-                    st.error("❌ Mot de passe incorrect")
-        
-        st.markdown("---")
-        st.info("💡 Pour obtenir le mot de passe, contactez l'administrateur du système.")
+    st.markdown("---")
+    st.info("💡 Pour obtenir le mot de passe, contactez l'administrateur du système.")
     
     return False
 
@@ -610,11 +1031,42 @@ def check_authentication(db: DatabaseManager):
 # FONCTIONS STREAMLIT
 # ============================================================================
 
+# Champs mot de passe admin ; chacun garde son propre résultat de vérification
+CHAMPS_ADMIN = ("pwd_admin_sidebar", "pwd_admin_parametres")
+
+def _empreinte_saisie(pwd):
+    return hashlib.sha256(pwd.encode()).hexdigest()
+
+def verifier_acces_admin(db: DatabaseManager, cle_champ):
+    """Callback du champ mot de passe admin : PBKDF2 une seule fois par modification"""
+    pwd = st.session_state.get(cle_champ, "")
+    valeur_stockee = _cached_param(db, 'mot_de_passe')
+    if verifier_mot_de_passe(pwd, valeur_stockee):
+        # Lié à la saisie vérifiée et au mot de passe en vigueur à ce moment
+        st.session_state[f"{cle_champ}_ok"] = (_empreinte_saisie(pwd), valeur_stockee)
+    else:
+        st.session_state.pop(f"{cle_champ}_ok", None)
+
+def acces_admin_valide(db: DatabaseManager, cle_champ, pwd):
+    """Vrai si la valeur actuelle du champ est celle qui a été vérifiée, et toujours en vigueur"""
+    verifie = st.session_state.get(f"{cle_champ}_ok")
+    return (
+        bool(pwd) and verifie is not None
+        and hmac.compare_digest(verifie[0], _empreinte_saisie(pwd))
+        and verifie[1] == _cached_param(db, 'mot_de_passe')
+    )
+
+def oublier_acces_admin():
+    for cle_champ in CHAMPS_ADMIN:
+        st.session_state.pop(f"{cle_champ}_ok", None)
+
 def sidebar_authentication(db: DatabaseManager):
     st.sidebar.header("🔒 Administration")
-    pwd = st.sidebar.text_input("Mot de passe admin", type="password")
-    valid_pwd = db.obtenir_parametre('mot_de_passe')
-    if pwd and pwd == valid_pwd:
+    pwd = st.sidebar.text_input(
+        "Mot de passe admin", type="password", key="pwd_admin_sidebar",
+        on_change=verifier_acces_admin, args=(db, "pwd_admin_sidebar")
+    )
+    if acces_admin_valide(db, "pwd_admin_sidebar", pwd):
         st.sidebar.success("✅ Authentifié")
         if st.sidebar.button("🗑️ Réinitialiser toutes les données"):
             if st.sidebar.checkbox("⚠️ Confirmer la réinitialisation"):
@@ -644,13 +1096,12 @@ def formulaire_saisie(db: DatabaseManager):
     if interval_start > interval_end:
         st.warning("La date début doit être antérieure ou égale à la date fin.")
     else:
-        traitements_interval = db.obtenir_traitements(
-            interval_start.strftime('%Y-%m-%d'),
-            interval_end.strftime('%Y-%m-%d')
+        total_interval = _cached_somme_dossiers(
+            db,
+            db.obtenir_version(),
+            interval_start.isoformat(),
+            interval_end.isoformat()
         )
-        total_interval = sum(
-            t['dossiers_traites'] for t in traitements_interval
-        ) if traitements_interval else 0
         st.info(
             f"📊 Total dossiers du {interval_start.strftime('%d/%m/%Y')} "
             f"au {interval_end.strftime('%d/%m/%Y')} : {total_interval}"
@@ -665,369 +1116,355 @@ def formulaire_saisie(db: DatabaseManager):
         "🗑️ Supprimer une saisie"
     ])
 
-    # ONGLET 1 : NOUVELLE SAISIE
     with tab1:
-        st.subheader("🔄 Choix du mode de saisie")
-        mode = st.radio("Saisir par :", ("Journalier", "Par période"), index=0, key="mode_saisie")
-
-        if mode == "Journalier":
-            with st.form("form_journalier", clear_on_submit=True):
-                date_input = st.date_input("Date de traitement", value=date.today())
-                archivistes = db.obtenir_archivistes()
-                archiviste_sel = st.selectbox("Archiviste", options=archivistes)
-                dossiers = st.number_input("Dossiers traités", min_value=0, step=1, value=0)
-                commentaire = st.text_area("Commentaire (optionnel)", height=80)
-                submitted = st.form_submit_button("✅ Valider Journalier")
-                if submitted:
-                    avertissements = []
-                    if date_input.weekday() >= 5:
-                        avertissements.append("⚠️ Date en weekend (Samedi ou Dimanche)")
-                    if date_input > date.today():
-                        avertissements.append("⚠️ La date est dans le futur")
-                    if dossiers == 0:
-                        avertissements.append("⚠️ Aucun dossier traité")
-                    if dossiers > 1000:
-                        avertissements.append("⚠️ Nombre très élevé de dossiers")
-                    if avertissements:
-                        st.warning("Votre saisie comporte des points d'attention :")
-                        for msg in avertissements:
-                            st.markdown(f"- {msg}")
-                        ok = st.checkbox("Je confirme malgré les avertissements", key="ok_journalier")
-                        if not ok:
-                            st.info("Cochez la case pour confirmer malgré les avertissements.")
-                            return
-                    try:
-                        db.ajouter_traitement(
-                            date_input.strftime("%Y-%m-%d"),
-                            archiviste_sel,
-                            int(dossiers),
-                            commentaire
-                        )
-                        st.success(
-                            f"✅ Traitement enregistré : {dossiers} dossiers par {archiviste_sel} "
-                            f"le {date_input.strftime('%d/%m/%Y')}"
-                        )
-                    except Exception as e:
-                        st.error(f"❌ Erreur lors de l'enregistrement : {e}")
-
-        else:  # Mode Par période
-            with st.form("form_periode", clear_on_submit=True):
-                st.markdown("**Période de saisie (jours ouvrés uniquement)**")
-                perA, perB, perC = st.columns(3)
-                with perA:
-                    start_per = st.date_input(
-                        "Date début",
-                        value=date.today() - timedelta(days=7),
-                        key="start_per"
+        afficher_onglet_nouvelle_saisie(db)
+    with tab2:
+        afficher_onglet_modification(db)
+    with tab3:
+        afficher_onglet_suppression(db)
+
+@st.fragment
+def afficher_onglet_nouvelle_saisie(db: DatabaseManager):
+    """Onglet 1 : saisie journalière ou répartie sur une période"""
+    import pandas as pd  # import différé : inutile sur l'accueil
+    st.subheader("🔄 Choix du mode de saisie")
+    mode = st.radio("Saisir par :", ("Journalier", "Par période"), index=0, key="mode_saisie")
+
+    if mode == "Journalier":
+        with st.form("form_journalier", clear_on_submit=True):
+            date_input = st.date_input("Date de traitement", value=date.today())
+            archivistes = _cached_archivistes(db)
+            archiviste_sel = st.selectbox("Archiviste", options=archivistes)
+            dossiers = st.number_input("Dossiers traités", min_value=0, step=1, value=0)
+            commentaire = st.text_area("Commentaire (optionnel)", height=80)
+            submitted = st.form_submit_button("✅ Valider Journalier")
+            if submitted:
+                controles = (
+                    (date_input.weekday() >= 5, "⚠️ Date en weekend (Samedi ou Dimanche)"),
+                    (date_input > date.today(), "⚠️ La date est dans le futur"),
+                    (dossiers == 0, "⚠️ Aucun dossier traité"),
+                    (dossiers > 1000, "⚠️ Nombre très élevé de dossiers"),
+                )
+                avertissements = [msg for condition, msg in controles if condition]
+                if avertissements:
+                    st.warning("Votre saisie comporte des points d'attention :")
+                    for msg in avertissements:
+                        st.markdown(f"- {msg}")
+                    ok = st.checkbox("Je confirme malgré les avertissements", key="ok_journalier")
+                    if not ok:
+                        st.info("Cochez la case pour confirmer malgré les avertissements.")
+                        return
+                try:
+                    db.ajouter_traitement(
+                        date_input.isoformat(),
+                        archiviste_sel,
+                        int(dossiers),
+                        commentaire
                     )
-                with perB:
-                    end_per = st.date_input(
-                        "Date fin",
-                        value=date.today(),
-                        key="end_per"
+                    st.success(
+                        f"✅ Traitement enregistré : {dossiers} dossiers par {archiviste_sel} "
+                        f"le {date_input.strftime('%d/%m/%Y')}"
                     )
-                with perC:
-                    archivistes = db.obtenir_archivistes()
-                    archiviste_sel2 = st.selectbox("Archiviste", options=archivistes, key="arch_periode")
-                total_dossiers_per = st.number_input(
-                    "Total dossiers traités sur la période",
-                    min_value=0, step=1, value=0, key="total_per"
+                except Exception as e:
+                    st.error(f"❌ Erreur lors de l'enregistrement : {e}")
+
+    else:  # Mode Par période
+        with st.form("form_periode", clear_on_submit=True):
+            st.markdown("**Période de saisie (jours ouvrés uniquement)**")
+            perA, perB, perC = st.columns(3)
+            with perA:
+                start_per = st.date_input(
+                    "Date début",
+                    value=date.today() - timedelta(days=7),
+                    key="start_per"
                 )
-                commentaire_per = st.text_area("Commentaire (optionnel)", height=80, key="comm_per")
-                submitted_per = st.form_submit_button("✅ Valider Période")
-                if submitted_per:
-                    if start_per > end_per:
-                        st.error("La date début doit être antérieure ou égale à la date fin.")
-                        return
-                    # Construire liste des jours ouvrés
-                    current = start_per
-                    jours_ouvres = []
-                    while current <= end_per:
-                        if current.weekday() < 5:
-                            jours_ouvres.append(current)
-                        current += timedelta(days=1)
-                    nb_jours = len(jours_ouvres)
-                    if nb_jours == 0:
-                        st.error("Aucun jour ouvré dans cette période.")
-                        return
-                    # Répartir dossiers également
-                    base = total_dossiers_per // nb_jours
-                    reste = total_dossiers_per % nb_jours
-                    try:
-                        for i, d in enumerate(jours_ouvres):
-                            dossiers_j = base + (1 if i < reste else 0)
-                            db.ajouter_traitement(
-                                d.strftime("%Y-%m-%d"),
-                                archiviste_sel2,
-                                dossiers_j,
-                                commentaire_per
-                            )
-                        st.success(
-                            f"✅ Période enregistrée : {total_dossiers_per} dossiers répartis "
-                            f"sur {nb_jours} jours ouvrés."
-                        )
-                    except Exception as e:
-                        st.error(f"❌ Erreur lors de l'enregistrement des entrées : {e}")
-
-    # ONGLET 2 : MODIFIER UNE SAISIE
-    with tab2:
-        st.subheader("✏️ Modifier une saisie existante")
-        
-        # Filtres pour rechercher la saisie à modifier
-        col_search1, col_search2 = st.columns(2)
-        with col_search1:
-            date_recherche = st.date_input(
-                "Date de la saisie à modifier",
-                value=date.today(),
-                key="date_recherche_modif"
-            )
-        with col_search2:
-            archivistes_all = ["Tous"] + db.obtenir_archivistes(actifs_seulement=False)
-            archiviste_filtre = st.selectbox(
-                "Filtrer par archiviste",
-                options=archivistes_all,
-                key="archiviste_filtre_modif"
-            )
-        
-        # Rechercher les saisies
-        date_str = date_recherche.strftime('%Y-%m-%d')
-        traitements_jour = db.obtenir_traitements(date_str, date_str)
-        
-        if archiviste_filtre != "Tous":
-            traitements_jour = [t for t in traitements_jour if t['archiviste'] == archiviste_filtre]
-        
-        if traitements_jour:
-            st.write(f"**Saisies trouvées pour le {date_recherche.strftime('%d/%m/%Y')} :**")
-            
-            # Afficher les saisies sous forme de sélection
-            saisies_options = []
-            for t in traitements_jour:
-                option = f"ID:{t['id']} - {t['archiviste']} - {t['dossiers_traites']} dossiers"
-                if t['commentaire']:
-                    option += f" - ({t['commentaire'][:50]}...)" if len(t['commentaire']) > 50 else f" - ({t['commentaire']})"
-                saisies_options.append((option, t))
-            
-            if saisies_options:
-                saisie_selectionnee = st.selectbox(
-                    "Choisir la saisie à modifier :",
-                    options=[opt[0] for opt in saisies_options],
-                    key="saisie_a_modifier"
+            with perB:
+                end_per = st.date_input(
+                    "Date fin",
+                    value=date.today(),
+                    key="end_per"
                 )
-                
-                # Trouver la saisie correspondante
-                traitement_a_modifier = None
-                for opt in saisies_options:
-                    if opt[0] == saisie_selectionnee:
-                        traitement_a_modifier = opt[1]
-                        break
-                
-                if traitement_a_modifier:
-                    st.markdown("---")
-                    st.write("**Modifier les informations :**")
-                    
-                    with st.form("form_modification"):
-                        # Pré-remplir avec les valeurs actuelles
-                        nouvelle_date = st.date_input(
-                            "Nouvelle date :",
-                            value=datetime.strptime(traitement_a_modifier['date_traitement'], "%Y-%m-%d").date(),
-                            key="nouvelle_date_modif"
-                        )
-                        
-                        archivistes_modif = db.obtenir_archivistes()
-                        index_archiviste = 0
-                        if traitement_a_modifier['archiviste'] in archivistes_modif:
-                            index_archiviste = archivistes_modif.index(traitement_a_modifier['archiviste'])
-                        
-                        nouvel_archiviste = st.selectbox(
-                            "Nouvel archiviste :",
-                            options=archivistes_modif,
-                            index=index_archiviste,
-                            key="nouvel_archiviste_modif"
-                        )
-                        
-                        nouveaux_dossiers = st.number_input(
-                            "Nouveau nombre de dossiers :",
-                            min_value=0,
-                            value=traitement_a_modifier['dossiers_traites'],
-                            step=1,
-                            key="nouveaux_dossiers_modif"
-                        )
-                        
-                        nouveau_commentaire = st.text_area(
-                            "Nouveau commentaire :",
-                            value=traitement_a_modifier['commentaire'] or "",
-                            height=80,
-                            key="nouveau_commentaire_modif"
-                        )
-                        
-                        submitted_modif = st.form_submit_button("✅ Enregistrer les modifications")
-                        
-                        if submitted_modif:
-                            try:
-                                with sqlite3.connect(db.db_path) as conn:
-                                    cursor = conn.cursor()
-                                    cursor.execute("""
-                                        UPDATE traitements 
-                                        SET date_traitement = ?, archiviste = ?, dossiers_traites = ?, commentaire = ?
-                                        WHERE id = ?
-                                    """, (
-                                        nouvelle_date.strftime("%Y-%m-%d"),
-                                        nouvel_archiviste,
-                                        nouveaux_dossiers,
-                                        nouveau_commentaire,
-                                        traitement_a_modifier['id']
-                                    ))
-                                    conn.commit()
-                                
-                                st.success(f"✅ Saisie ID:{traitement_a_modifier['id']} modifiée avec succès !")
-                                st.rerun()  # Actualiser la page
-                                
-                            except Exception as e:
-                                st.error(f"❌ Erreur lors de la modification : {e}")
-        else:
-            st.info("Aucune saisie trouvée pour cette date et ces critères.")
-
-    # ONGLET 3 : SUPPRIMER UNE SAISIE
-    with tab3:
-        st.subheader("🗑️ Supprimer une saisie spécifique")
-        
-        # Filtres pour rechercher la saisie à supprimer
-        col_search3, col_search4 = st.columns(2)
-        with col_search3:
-            date_recherche_suppr = st.date_input(
-                "Date de la saisie à supprimer",
-                value=date.today(),
-                key="date_recherche_suppr"
-            )
-        with col_search4:
-            archivistes_all_suppr = ["Tous"] + db.obtenir_archivistes(actifs_seulement=False)
-            archiviste_filtre_suppr = st.selectbox(
-                "Filtrer par archiviste",
-                options=archivistes_all_suppr,
-                key="archiviste_filtre_suppr"
+            with perC:
+                archivistes = _cached_archivistes(db)
+                archiviste_sel2 = st.selectbox("Archiviste", options=archivistes, key="arch_periode")
+            total_dossiers_per = st.number_input(
+                "Total dossiers traités sur la période",
+                min_value=0, step=1, value=0, key="total_per"
             )
+            commentaire_per = st.text_area("Commentaire (optionnel)", height=80, key="comm_per")
+            submitted_per = st.form_submit_button("✅ Valider Période")
+            if submitted_per:
+                if start_per > end_per:
+                    st.error("La date début doit être antérieure ou égale à la date fin.")
+                    return
+                # Construire liste des jours ouvrés (lundi à vendredi)
+                jours_ouvres = pd.bdate_range(start_per, end_per).strftime("%Y-%m-%d")
+                nb_jours = len(jours_ouvres)
+                if nb_jours == 0:
+                    st.error("Aucun jour ouvré dans cette période.")
+                    return
+                # Répartir dossiers également
+                base, reste = divmod(total_dossiers_per, nb_jours)
+                repartition = [base + 1] * reste + [base] * (nb_jours - reste)
+                try:
+                    db.ajouter_traitements([
+                        (d, archiviste_sel2, n, commentaire_per)
+                        for d, n in zip(jours_ouvres, repartition)
+                    ])
+                    st.success(
+                        f"✅ Période enregistrée : {total_dossiers_per} dossiers répartis "
+                        f"sur {nb_jours} jours ouvrés."
+                    )
+                except Exception as e:
+                    st.error(f"❌ Erreur lors de l'enregistrement des entrées : {e}")
+
+@st.fragment
+def afficher_onglet_modification(db: DatabaseManager):
+    """Onglet 2 : recherche et modification d'une saisie"""
+    st.subheader("✏️ Modifier une saisie existante")
+    
+    # Filtres pour rechercher la saisie à modifier
+    col_search1, col_search2 = st.columns(2)
+    with col_search1:
+        date_recherche = st.date_input(
+            "Date de la saisie à modifier",
+            value=date.today(),
+            key="date_recherche_modif"
+        )
+    with col_search2:
+        archivistes_all = ["Tous"] + [a[0] for a in _cached_archivistes(db, actifs_seulement=False)]
+        archiviste_filtre = st.selectbox(
+            "Filtrer par archiviste",
+            options=archivistes_all,
+            key="archiviste_filtre_modif"
+        )
+    
+    # Rechercher les saisies
+    date_str = date_recherche.isoformat()
+    traitements_jour = _cached_traitements(
+        db, db.obtenir_version(), date_str, date_str,
+        archiviste=None if archiviste_filtre == "Tous" else archiviste_filtre
+    )
+    
+    if traitements_jour:
+        st.write(f"**Saisies trouvées pour le {date_recherche.strftime('%d/%m/%Y')} :**")
         
-        # Rechercher les saisies
-        date_str_suppr = date_recherche_suppr.strftime('%Y-%m-%d')
-        traitements_jour_suppr = db.obtenir_traitements(date_str_suppr, date_str_suppr)
-        
-        if archiviste_filtre_suppr != "Tous":
-            traitements_jour_suppr = [t for t in traitements_jour_suppr if t['archiviste'] == archiviste_filtre_suppr]
+        # Afficher les saisies sous forme de sélection
+        # Libellé -> saisie (le libellé commence par l'ID, donc unique)
+        saisies_par_option = {}
+        for t in traitements_jour:
+            option = f"ID:{t['id']} - {t['archiviste']} - {t['dossiers_traites']} dossiers"
+            if t['commentaire']:
+                option += f" - ({t['commentaire'][:50]}...)" if len(t['commentaire']) > 50 else f" - ({t['commentaire']})"
+            saisies_par_option[option] = t
         
-        if traitements_jour_suppr:
-            st.write(f"**Saisies trouvées pour le {date_recherche_suppr.strftime('%d/%m/%Y')} :**")
-            
-            # Afficher les saisies sous forme de tableau
-            affichage_suppr = []
-            for t in traitements_jour_suppr:
-                affichage_suppr.append({
-                    "ID": t['id'],
-                    "Archiviste": t['archiviste'],
-                    "Dossiers": t['dossiers_traites'],
-                    "Commentaire": t['commentaire'] or ""
-                })
-            
-            df_suppr = pd.DataFrame(affichage_suppr)
-            st.dataframe(df_suppr, use_container_width=True)
-            
-            # Sélection de la saisie à supprimer
-            ids_disponibles = [t['id'] for t in traitements_jour_suppr]
-            id_a_supprimer = st.selectbox(
-                "Choisir l'ID de la saisie à supprimer :",
-                options=ids_disponibles,
-                key="id_a_supprimer"
+        if saisies_par_option:
+            saisie_selectionnee = st.selectbox(
+                "Choisir la saisie à modifier :",
+                options=list(saisies_par_option),
+                key="saisie_a_modifier"
             )
             
-            # Trouver les détails de la saisie sélectionnée
-            saisie_a_supprimer = next((t for t in traitements_jour_suppr if t['id'] == id_a_supprimer), None)
+            # Trouver la saisie correspondante
+            traitement_a_modifier = saisies_par_option.get(saisie_selectionnee)
             
-            if saisie_a_supprimer:
-                st.warning(f"""
-                **Attention !** Vous êtes sur le point de supprimer :
-                - **ID :** {saisie_a_supprimer['id']}
-                - **Date :** {datetime.strptime(saisie_a_supprimer['date_traitement'], "%Y-%m-%d").strftime('%d/%m/%Y')}
-                - **Archiviste :** {saisie_a_supprimer['archiviste']}
-                - **Dossiers :** {saisie_a_supprimer['dossiers_traites']}
-                - **Commentaire :** {saisie_a_supprimer['commentaire'] or 'Aucun'}
-                """)
+            if traitement_a_modifier:
+                st.markdown("---")
+                st.write("**Modifier les informations :**")
                 
-                confirmation = st.checkbox(
-                    f"⚠️ Je confirme vouloir supprimer définitivement la saisie ID:{id_a_supprimer}",
-                    key="confirmation_suppression"
-                )
-                
-                if confirmation:
-                    if st.button("🗑️ Supprimer définitivement", type="secondary"):
+                with st.form("form_modification"):
+                    # Pré-remplir avec les valeurs actuelles
+                    nouvelle_date = st.date_input(
+                        "Nouvelle date :",
+                        value=date.fromisoformat(traitement_a_modifier['date_traitement']),
+                        key="nouvelle_date_modif"
+                    )
+                    
+                    archivistes_modif = _cached_archivistes(db)
+                    index_archiviste = 0
+                    if traitement_a_modifier['archiviste'] in archivistes_modif:
+                        index_archiviste = archivistes_modif.index(traitement_a_modifier['archiviste'])
+                    
+                    nouvel_archiviste = st.selectbox(
+                        "Nouvel archiviste :",
+                        options=archivistes_modif,
+                        index=index_archiviste,
+                        key="nouvel_archiviste_modif"
+                    )
+                    
+                    nouveaux_dossiers = st.number_input(
+                        "Nouveau nombre de dossiers :",
+                        min_value=0,
+                        value=traitement_a_modifier['dossiers_traites'],
+                        step=1,
+                        key="nouveaux_dossiers_modif"
+                    )
+                    
+                    nouveau_commentaire = st.text_area(
+                        "Nouveau commentaire :",
+                        value=traitement_a_modifier['commentaire'] or "",
+                        height=80,
+                        key="nouveau_commentaire_modif"
+                    )
+                    
+                    submitted_modif = st.form_submit_button("✅ Enregistrer les modifications")
+                    
+                    if submitted_modif:
                         try:
-                            with sqlite3.connect(db.db_path) as conn:
-                                cursor = conn.cursor()
-                                cursor.execute("DELETE FROM traitements WHERE id = ?", (id_a_supprimer,))
-                                conn.commit()
+                            db.modifier_traitement(
+                                traitement_a_modifier['id'],
+                                nouvelle_date.isoformat(),
+                                nouvel_archiviste,
+                                nouveaux_dossiers,
+                                nouveau_commentaire
+                            )
                             
-                            st.success(f"✅ Saisie ID:{id_a_supprimer} supprimée avec succès !")
-                            st.rerun()  # Actualiser la page
+                            st.success(f"✅ Saisie ID:{traitement_a_modifier['id']} modifiée avec succès !")
+                            st.rerun(scope="fragment")  # Actualiser l'onglet seulement
                             
                         except Exception as e:
-                            st.error(f"❌ Erreur lors de la suppression : {e}")
-        else:
-            st.info("Aucune saisie trouvée pour cette date et ces critères.")
+                            st.error(f"❌ Erreur lors de la modification : {e}")
+    else:
+        st.info("Aucune saisie trouvée pour cette date et ces critères.")
+
+@st.fragment
+def afficher_onglet_suppression(db: DatabaseManager):
+    """Onglet 3 : suppression d'une saisie ou par lot"""
+    import pandas as pd
+    st.subheader("🗑️ Supprimer une saisie spécifique")
+    
+    # Filtres pour rechercher la saisie à supprimer
+    col_search3, col_search4 = st.columns(2)
+    with col_search3:
+        date_recherche_suppr = st.date_input(
+            "Date de la saisie à supprimer",
+            value=date.today(),
+            key="date_recherche_suppr"
+        )
+    with col_search4:
+        archivistes_all_suppr = ["Tous"] + [a[0] for a in _cached_archivistes(db, actifs_seulement=False)]
+        archiviste_filtre_suppr = st.selectbox(
+            "Filtrer par archiviste",
+            options=archivistes_all_suppr,
+            key="archiviste_filtre_suppr"
+        )
+    
+    # Rechercher les saisies
+    date_str_suppr = date_recherche_suppr.isoformat()
+    traitements_jour_suppr = _cached_traitements(
+        db, db.obtenir_version(), date_str_suppr, date_str_suppr,
+        archiviste=None if archiviste_filtre_suppr == "Tous" else archiviste_filtre_suppr
+    )
+    
+    if traitements_jour_suppr:
+        st.write(f"**Saisies trouvées pour le {date_recherche_suppr.strftime('%d/%m/%Y')} :**")
         
-        # Section de suppression groupée (comme avant)
-        st.markdown("---")
-        st.subheader("🗑️ Suppression groupée")
+        # Afficher les saisies sous forme de tableau
+        df_suppr = pd.DataFrame({
+            "ID": [t['id'] for t in traitements_jour_suppr],
+            "Archiviste": [t['archiviste'] for t in traitements_jour_suppr],
+            "Dossiers": [t['dossiers_traites'] for t in traitements_jour_suppr],
+            "Commentaire": [t['commentaire'] or "" for t in traitements_jour_suppr]
+        })
+        st.dataframe(df_suppr, use_container_width=True, hide_index=True)
         
-        col_group1, col_group2 = st.columns(2)
+        # Sélection de la saisie à supprimer
+        saisies_par_id = {t['id']: t for t in traitements_jour_suppr}
+        id_a_supprimer = st.selectbox(
+            "Choisir l'ID de la saisie à supprimer :",
+            options=list(saisies_par_id),
+            key="id_a_supprimer"
+        )
         
-        with col_group1:
-            st.markdown("**Supprimer toutes les saisies d'une date :**")
-            date_suppr_groupe = st.date_input(
-                "Date à supprimer complètement :",
-                value=date.today(),
-                key="date_suppr_groupe"
-            )
-            if st.button("🗑️ Supprimer toute la date", key="btn_suppr_date"):
-                date_str_groupe = date_suppr_groupe.strftime("%Y-%m-%d")
-                with sqlite3.connect(db.db_path) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("DELETE FROM traitements WHERE date_traitement = ?", (date_str_groupe,))
-                    n = cursor.rowcount
-                    conn.commit()
-                if n > 0:
-                    st.success(f"✅ {n} saisie(s) supprimée(s) pour le {date_suppr_groupe.strftime('%d/%m/%Y')}.")
-                else:
-                    st.info(f"Aucune saisie trouvée pour le {date_suppr_groupe.strftime('%d/%m/%Y')}.")
+        # Trouver les détails de la saisie sélectionnée
+        saisie_a_supprimer = saisies_par_id.get(id_a_supprimer)
         
-        with col_group2:
-            st.markdown("**Supprimer toutes les saisies d'un archiviste :**")
-            archivistes_suppr_groupe = db.obtenir_archivistes(actifs_seulement=False)
-            noms_suppr = [a[0] for a in archivistes_suppr_groupe]
-            archiviste_suppr_groupe = st.selectbox(
-                "Archiviste à supprimer :",
-                options=noms_suppr,
-                key="archiviste_suppr_groupe"
+        if saisie_a_supprimer:
+            st.warning(f"""
+            **Attention !** Vous êtes sur le point de supprimer :
+            - **ID :** {saisie_a_supprimer['id']}
+            - **Date :** {date_fr(saisie_a_supprimer['date_traitement'])}
+            - **Archiviste :** {saisie_a_supprimer['archiviste']}
+            - **Dossiers :** {saisie_a_supprimer['dossiers_traites']}
+            - **Commentaire :** {saisie_a_supprimer['commentaire'] or 'Aucun'}
+            """)
+            
+            confirmation = st.checkbox(
+                f"⚠️ Je confirme vouloir supprimer définitivement la saisie ID:{id_a_supprimer}",
+                key="confirmation_suppression"
             )
-            if st.button("🗑️ Supprimer tout l'archiviste", key="btn_suppr_archiviste"):
-                with sqlite3.connect(db.db_path) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("DELETE FROM traitements WHERE archiviste = ?", (archiviste_suppr_groupe,))
-                    n2 = cursor.rowcount
-                    conn.commit()
-                if n2 > 0:
-                    st.success(f"✅ {n2} saisie(s) supprimée(s) pour l'archiviste « {archiviste_suppr_groupe} ».")
-                else:
-                    st.info(f"Aucune saisie trouvée pour l'archiviste « {archiviste_suppr_groupe} ».")
+            
+            if confirmation:
+                if st.button("🗑️ Supprimer définitivement", type="secondary"):
+                    try:
+                        db.supprimer_traitement(id_a_supprimer)
+                        
+                        st.success(f"✅ Saisie ID:{id_a_supprimer} supprimée avec succès !")
+                        st.rerun(scope="fragment")  # Actualiser l'onglet seulement
+                        
+                    except Exception as e:
+                        st.error(f"❌ Erreur lors de la suppression : {e}")
+    else:
+        st.info("Aucune saisie trouvée pour cette date et ces critères.")
+    
+    # Section de suppression groupée (comme avant)
+    st.markdown("---")
+    st.subheader("🗑️ Suppression groupée")
+    
+    col_group1, col_group2 = st.columns(2)
+    
+    with col_group1:
+        supprimer_saisies_par_date(db)
+    
+    with col_group2:
+        supprimer_saisies_par_archiviste(db)
+
+@st.fragment
+def supprimer_saisies_par_date(db: DatabaseManager):
+    """Suppression groupée d'une date, relancée seule au clic"""
+    st.markdown("**Supprimer toutes les saisies d'une date :**")
+    date_suppr_groupe = st.date_input(
+        "Date à supprimer complètement :",
+        value=date.today(),
+        key="date_suppr_groupe"
+    )
+    if st.button("🗑️ Supprimer toute la date", key="btn_suppr_date"):
+        n = db.supprimer_traitements_par_date(date_suppr_groupe.isoformat())
+        if n > 0:
+            st.success(f"✅ {n} saisie(s) supprimée(s) pour le {date_suppr_groupe.strftime('%d/%m/%Y')}.")
+        else:
+            st.info(f"Aucune saisie trouvée pour le {date_suppr_groupe.strftime('%d/%m/%Y')}.")
+
+@st.fragment
+def supprimer_saisies_par_archiviste(db: DatabaseManager):
+    """Suppression groupée d'un archiviste, relancée seule au clic"""
+    st.markdown("**Supprimer toutes les saisies d'un archiviste :**")
+    archivistes_suppr_groupe = _cached_archivistes(db, actifs_seulement=False)
+    noms_suppr = [a[0] for a in archivistes_suppr_groupe]
+    archiviste_suppr_groupe = st.selectbox(
+        "Archiviste à supprimer :",
+        options=noms_suppr,
+        key="archiviste_suppr_groupe"
+    )
+    if st.button("🗑️ Supprimer tout l'archiviste", key="btn_suppr_archiviste"):
+        n2 = db.supprimer_traitements_par_archiviste(archiviste_suppr_groupe)
+        if n2 > 0:
+            st.success(f"✅ {n2} saisie(s) supprimée(s) pour l'archiviste « {archiviste_suppr_groupe} ».")
+        else:
+            st.info(f"Aucune saisie trouvée pour l'archiviste « {archiviste_suppr_groupe} ».")
 
 def afficher_kpis_et_performances(db: DatabaseManager, stats_calc: StatisticsCalculator):
     """Affichage avec les nouveaux calculs"""
     st.header("📊 Vue d'ensemble")
-    kpis = stats_calc.calculer_kpis_globaux()
-    perf_jour = stats_calc.calculer_performances_journalieres()
-    perf_semaine = stats_calc.calculer_performances_hebdomadaires()
+    version = db.obtenir_version()
+    kpis = _cached_kpis(stats_calc, version)
+    perf_jour = _cached_perf_jour(stats_calc, version, date.today())
+    perf_semaine = _cached_perf_semaine(stats_calc, version, date.today())
     
     c1, c2, c3, c4 = st.columns(4)
-    c1.metric(label="Stock initial", value=f"{kpis['stock_initial']:,}".replace(",", " "))
-    c2.metric(label="Dossiers traités", value=f"{kpis['dossiers_traites']:,}".replace(",", " "))
-    c3.metric(label="Stock restant", value=f"{kpis['stock_restant']:,}".replace(",", " "))
+    c1.metric(label="Stock initial", value=formater_nombre(kpis['stock_initial']))
+    c2.metric(label="Dossiers traités", value=formater_nombre(kpis['dossiers_traites']))
+    c3.metric(label="Stock restant", value=formater_nombre(kpis['stock_restant']))
     c4.metric(label="% traité", value=f"{kpis['pourcentage_traite']:.1f}%")
     
     st.markdown("---")
@@ -1058,26 +1495,23 @@ def afficher_kpis_et_performances(db: DatabaseManager, stats_calc: StatisticsCal
 
 def export_analyse(db: DatabaseManager, stats_calc: StatisticsCalculator):
     """Export avec les nouveaux calculs"""
+    import pandas as pd
     # Générer le CSV formaté
-    kpis = stats_calc.calculer_kpis_globaux()
-    traitements = db.obtenir_traitements()
-    # Calcul des dates uniques
-    dates = set(t['date_traitement'] for t in traitements)
-    jours_ecoules = len(dates)
+    version = db.obtenir_version()
+    kpis = _cached_kpis(stats_calc, version)
+    # Nombre de dates uniques, compté par SQLite
+    jours_ecoules = db.compter_jours_saisis()
     total_dossiers = kpis['dossiers_traites']
     taux_reussite = kpis['pourcentage_traite']
     stock_restant = kpis['stock_restant']
-    objectif = int(db.obtenir_parametre('objectif_journalier') or 200)
-    seuil_objectif = float(db.obtenir_parametre('seuil_objectif') or 0.9)
+    objectif = int(_cached_param(db, 'objectif_journalier') or 200)
+    seuil_objectif = float(_cached_param(db, 'seuil_objectif') or 0.9)
     seuil_journalier = objectif * seuil_objectif  # 180 dossiers
     
     if jours_ecoules > 0:
         taux_journalier_reel = total_dossiers / jours_ecoules
         # Calcul selon la nouvelle logique
-        if taux_journalier_reel >= seuil_journalier:
-            perf_journalier_pct = (taux_journalier_reel / objectif) * 100
-        else:
-            perf_journalier_pct = (taux_journalier_reel / seuil_journalier) * 90
+        perf_journalier_pct, _ = stats_calc.calculer_taux(taux_journalier_reel, seuil_journalier, objectif)
         perf_hebdo_pct = perf_journalier_pct
         perf_mensuel_pct = perf_journalier_pct
         perf_annuel_pct = perf_journalier_pct
@@ -1085,13 +1519,15 @@ def export_analyse(db: DatabaseManager, stats_calc: StatisticsCalculator):
         taux_journalier_reel = 0
         perf_journalier_pct = perf_hebdo_pct = perf_mensuel_pct = perf_annuel_pct = 0
     
-    actifs = db.obtenir_archivistes()
+    actifs = _cached_archivistes(db)
     nb_archivistes = len(actifs)
 
     # Section archivistes performance totale (tous traitements)
-    perf_arch = stats_calc.obtenir_performances_30j_par_archiviste()
+    perf_arch = _cached_perf_30j(stats_calc, version, date.today())
 
-    buffer = StringIO()
+    # Écriture directe en octets latin1 : pas de copie str intermédiaire
+    contenu = BytesIO()
+    buffer = TextIOWrapper(contenu, encoding="latin1", newline="")
     writer = csv.writer(buffer, delimiter=';')
     writer.writerow(["=== ANALYSE TABLEAU DE BORD SERVICE ARCHIVES ==="])
     writer.writerow([])
@@ -1120,22 +1556,24 @@ def export_analyse(db: DatabaseManager, stats_calc: StatisticsCalculator):
         "Nom", "Dossiers_Traités", "Jours_Travaillés", "Taux_Journalier",
         "Objectif_Individuel", "Seuil_90%", "Performance_%", "Statut"
     ])
-    for stat in perf_arch:
-        nom = stat['archiviste']
-        dossiers_t = stat['total_dossiers']
-        jours = stat['jours_travailles']
-        taux_j = (dossiers_t / jours) if jours else 0
-        objectif_ind = objectif
-        seuil_90 = stat['seuil_journalier']
-        perf_pct = stat['taux_objectif']
-        statut = stat['statut']
-        
-        writer.writerow([
-            nom, f"{dossiers_t}", f"{jours}", f"{taux_j:.1f}",
-            f"{objectif_ind}", f"{seuil_90}", f"{perf_pct:.1f}", statut
-        ])
+    df_perf = pd.DataFrame(perf_arch, columns=[
+        'archiviste', 'total_dossiers', 'jours_travailles',
+        'seuil_journalier', 'taux_objectif', 'statut'
+    ])
+    jours = df_perf['jours_travailles']
+    df_perf['taux_journalier'] = (df_perf['total_dossiers'] / jours.where(jours > 0)).fillna(0.0)
+    df_perf['objectif'] = objectif
+    # Les flottants (taux) sont formatés à 0,1 près par pandas, les entiers tels quels
+    df_perf[[
+        'archiviste', 'total_dossiers', 'jours_travailles', 'taux_journalier',
+        'objectif', 'seuil_journalier', 'taux_objectif', 'statut'
+    ]].to_csv(
+        buffer, sep=';', index=False, header=False,
+        float_format='%.1f', lineterminator="\r\n"
+    )
 
-    return buffer.getvalue()
+    buffer.detach()  # vide le tampon texte sans fermer contenu
+    return contenu.getvalue()
 
 def afficher_tableaux(db: DatabaseManager, stats_calc: StatisticsCalculator):
     st.sidebar.subheader("🔍 Filtrer les données par intervalle")
@@ -1144,9 +1582,12 @@ def afficher_tableaux(db: DatabaseManager, stats_calc: StatisticsCalculator):
     if start_date > end_date:
         st.sidebar.error("La date début doit être antérieure ou égale à la date fin.")
         return
-    traitements = db.obtenir_traitements(
-        start_date.strftime('%Y-%m-%d'),
-        end_date.strftime('%Y-%m-%d')
+    version = db.obtenir_version()
+    traitements = _cached_traitements(
+        db,
+        version,
+        start_date.isoformat(),
+        end_date.isoformat()
     )
     tab1, tab2, tab3, tab4 = st.tabs([
         "📋 Détail des traitements",
@@ -1155,279 +1596,246 @@ def afficher_tableaux(db: DatabaseManager, stats_calc: StatisticsCalculator):
         "📅 Performances annuelles"
     ])
     with tab1:
-        st.write(
-            f"### Détail des traitements du {start_date.strftime('%d/%m/%Y')} "
-            f"au {end_date.strftime('%d/%m/%Y')}"
-        )
-        if traitements:
-            affichage = []
-            for t in traitements:
-                d = datetime.strptime(t['date_traitement'], "%Y-%m-%d").strftime("%d/%m/%Y")
-                affichage.append({
-                    "ID": t['id'],
-                    "Date": d,
-                    "Archiviste": t['archiviste'],
-                    "Dossiers": t['dossiers_traites'],
-                    "Commentaire": t['commentaire'] or ""
-                })
-            df_display = pd.DataFrame(affichage)
-            st.dataframe(df_display, use_container_width=True)
-
-            csv_buffer = StringIO()
-            writer = csv.writer(csv_buffer)
-            writer.writerow(["ID", "Date", "Archiviste", "Dossiers", "Commentaire"])
-            for row in affichage:
-                writer.writerow([
-                    row["ID"], row["Date"], row["Archiviste"],
-                    row["Dossiers"], row["Commentaire"]
-                ])
-            st.download_button(
-                label="⬇️ Exporter CSV simple",
-                data=csv_buffer.getvalue().encode("utf-8-sig"),
-                file_name=f"traitements_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.csv",
-                mime="text/csv"
-            )
-        else:
-            st.info("Aucun traitement à afficher pour cet intervalle.")
-
+        afficher_onglet_detail(traitements, start_date, end_date)
     with tab2:
-        st.write("### 🌐 Performances hebdomadaires par archiviste")
-        stats_hebdo = stats_calc.obtenir_performances_hebdo_par_archiviste()
-        if stats_hebdo:
-            affichage = []
-            for i, stat in enumerate(stats_hebdo, start=1):
-                affichage.append({
-                    "Rang": f"#{i}",
-                    "Archiviste": stat['archiviste'],
-                    "Dossiers": stat['total_dossiers'],
-                    "Jours travaillés": stat['jours_travailles'],
-                    "Moyenne/J": stat['moyenne_jour'],
-                    "% Performance": f"{stat['taux_hebdo']}%",
-                    "Seuil (90%)": stat['seuil_reussite'],
-                    "État": stat['statut']
-                })
-            df_h = pd.DataFrame(affichage)
-            st.dataframe(df_h, use_container_width=True)
-        else:
-            st.info("Aucune donnée hebdomadaire pour le moment.")
-
+        afficher_onglet_hebdo(stats_calc, version)
     with tab3:
-        st.write("### 📊 Performances sur 30 derniers jours par archiviste")
-        stats_30 = stats_calc.obtenir_performances_30j_par_archiviste()
-        if stats_30:
-            affichage = []
-            for stat in stats_30:
-                affichage.append({
-                    "Archiviste": stat['archiviste'],
-                    "Total": stat['total_dossiers'],
-                    "Jours travaillés": stat['jours_travailles'],
-                    "Moyenne/J": stat['moyenne_jour'],
-                    "% Performance": f"{stat['taux_objectif']}%",
-                    "Seuil (90%)": stat['seuil_journalier'],
-                    "Statut": stat['statut']
-                })
-            df_30 = pd.DataFrame(affichage)
-            st.dataframe(df_30, use_container_width=True)
-        else:
-            st.info("Pas assez de données pour calculer les 30 derniers jours.")
-
+        afficher_onglet_30j(stats_calc, version)
     with tab4:
-        st.write("### 📅 Performances sur l'année par archiviste")
+        afficher_onglet_annuel(db, stats_calc)
+
+    # Bouton d'export d'analyse complet existant
+    st.markdown("---")
+    if st.button("⬇️ Exporter Analyse CSV complet"):
+        csv_data = export_analyse(db, stats_calc)
+        st.download_button(
+            label="Télécharger fichier d'analyse",
+            data=csv_data,
+            file_name=f"analyse_archives_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+            mime="text/csv"
+        )
+
+@st.fragment
+def afficher_onglet_detail(traitements, start_date, end_date):
+    """Onglet détail : liste de l'intervalle et export CSV simple"""
+    import pandas as pd
+    st.write(
+        f"### Détail des traitements du {start_date.strftime('%d/%m/%Y')} "
+        f"au {end_date.strftime('%d/%m/%Y')}"
+    )
+    if traitements:
+        # Construction par colonnes : pandas n'a pas à inférer chaque dict
+        df_display = pd.DataFrame({
+            "ID": [t['id'] for t in traitements],
+            "Date": [date_fr(t['date_traitement']) for t in traitements],
+            "Archiviste": [t['archiviste'] for t in traitements],
+            "Dossiers": [t['dossiers_traites'] for t in traitements],
+            "Commentaire": [t['commentaire'] or "" for t in traitements]
+        })
+        st.dataframe(df_display, use_container_width=True, hide_index=True)
+
+        st.download_button(
+            label="⬇️ Exporter CSV simple",
+            data=df_display.to_csv(index=False, lineterminator="\r\n").encode("utf-8-sig"),
+            file_name=f"traitements_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.csv",
+            mime="text/csv"
+        )
+    else:
+        st.info("Aucun traitement à afficher pour cet intervalle.")
+
+def afficher_onglet_hebdo(stats_calc: StatisticsCalculator, version):
+    import pandas as pd
+    st.write("### 🌐 Performances hebdomadaires par archiviste")
+    stats_hebdo = _cached_perf_hebdo(stats_calc, version, date.today())
+    if stats_hebdo:
+        df_h = pd.DataFrame({
+            "Rang": [f"#{i}" for i in range(1, len(stats_hebdo) + 1)],
+            "Archiviste": [stat['archiviste'] for stat in stats_hebdo],
+            "Dossiers": [stat['total_dossiers'] for stat in stats_hebdo],
+            "Jours travaillés": [stat['jours_travailles'] for stat in stats_hebdo],
+            "Moyenne/J": [stat['moyenne_jour'] for stat in stats_hebdo],
+            "% Performance": [f"{stat['taux_hebdo']}%" for stat in stats_hebdo],
+            "Seuil (90%)": [stat['seuil_reussite'] for stat in stats_hebdo],
+            "État": [stat['statut'] for stat in stats_hebdo]
+        })
+        st.dataframe(df_h, use_container_width=True, hide_index=True)
+    else:
+        st.info("Aucune donnée hebdomadaire pour le moment.")
+
+def afficher_onglet_30j(stats_calc: StatisticsCalculator, version):
+    import pandas as pd
+    st.write("### 📊 Performances sur 30 derniers jours par archiviste")
+    stats_30 = _cached_perf_30j(stats_calc, version, date.today())
+    if stats_30:
+        df_30 = pd.DataFrame({
+            "Archiviste": [stat['archiviste'] for stat in stats_30],
+            "Total": [stat['total_dossiers'] for stat in stats_30],
+            "Jours travaillés": [stat['jours_travailles'] for stat in stats_30],
+            "Moyenne/J": [stat['moyenne_jour'] for stat in stats_30],
+            "% Performance": [f"{stat['taux_objectif']}%" for stat in stats_30],
+            "Seuil (90%)": [stat['seuil_journalier'] for stat in stats_30],
+            "Statut": [stat['statut'] for stat in stats_30]
+        })
+        st.dataframe(df_30, use_container_width=True)
+    else:
+        st.info("Pas assez de données pour calculer les 30 derniers jours.")
+
+@st.fragment
+def afficher_onglet_annuel(db: DatabaseManager, stats_calc: StatisticsCalculator):
+    """Onglet annuel : changer d'année ou modifier une saisie ne relance que cet onglet"""
+    import pandas as pd
+    version = db.obtenir_version()
+    st.write("### 📅 Performances sur l'année par archiviste")
+    
+    # Sélecteur d'année
+    annee_courante = date.today().year
+    col_annee1, col_annee2 = st.columns([1, 3])
+    with col_annee1:
+        annee_selectee = st.selectbox(
+            "Année :", 
+            options=list(range(annee_courante - 5, annee_courante + 1)),
+            index=5,  # Année courante par défaut
+            key="annee_perf"
+        )
+    
+    stats_annee = _cached_perf_annuelles(stats_calc, version, annee_selectee)
+    
+    if stats_annee:
+        # Calculer quelques statistiques globales
+        total_dossiers_annee = sum(s['total_dossiers'] for s in stats_annee)
+        total_jours_travailles = sum(s['jours_travailles'] for s in stats_annee)
         
-        # Sélecteur d'année
-        annee_courante = date.today().year
-        col_annee1, col_annee2 = st.columns([1, 3])
-        with col_annee1:
-            annee_selectee = st.selectbox(
-                "Année :", 
-                options=list(range(annee_courante - 5, annee_courante + 1)),
-                index=5,  # Année courante par défaut
-                key="annee_perf"
-            )
+        # Afficher un résumé
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Total dossiers", formater_nombre(total_dossiers_annee))
+        col2.metric("Total jours travaillés", total_jours_travailles)
+        col3.metric("Moyenne globale/jour", f"{total_dossiers_annee/total_jours_travailles:.1f}" if total_jours_travailles > 0 else "0")
         
-        stats_annee = stats_calc.obtenir_performances_annuelles_par_archiviste(annee_selectee)
+        st.markdown("---")
         
-        if stats_annee:
-            # Calculer quelques statistiques globales
-            total_dossiers_annee = sum(s['total_dossiers'] for s in stats_annee)
-            total_jours_travailles = sum(s['jours_travailles'] for s in stats_annee)
-            
-            # Afficher un résumé
-            col1, col2, col3 = st.columns(3)
-            col1.metric("Total dossiers", f"{total_dossiers_annee:,}".replace(",", " "))
-            col2.metric("Total jours travaillés", total_jours_travailles)
-            col3.metric("Moyenne globale/jour", f"{total_dossiers_annee/total_jours_travailles:.1f}" if total_jours_travailles > 0 else "0")
-            
-            st.markdown("---")
-            
-            # Tableau détaillé
-            affichage_annee = []
-            for i, stat in enumerate(stats_annee, start=1):
-                affichage_annee.append({
-                    "Rang": f"#{i}",
-                    "Archiviste": stat['archiviste'],
-                    "Total dossiers": f"{stat['total_dossiers']:,}".replace(",", " "),
-                    "Jours travaillés": stat['jours_travailles'],
-                    "Moyenne/jour": stat['moyenne_jour'],
-                    "% Performance": f"{stat['taux_objectif']}%",
-                    "Seuil (90%)": stat['seuil_journalier'],
-                    "% Couverture année": f"{stat['couverture_annee']}%",
-                    "Statut": stat['statut']
-                })
-            
-            df_annee = pd.DataFrame(affichage_annee)
-            st.dataframe(df_annee, use_container_width=True)
-            
-            # NOUVEAU: Section de modification des saisies depuis le cumul annuel
-            st.markdown("---")
-            st.subheader("✏️ Modifier des saisies depuis le cumul annuel")
+        # Tableau détaillé (construit une fois par version des données et par année)
+        df_annee = _cached_tableau_annuel(stats_calc, version, annee_selectee)
+        st.dataframe(df_annee, use_container_width=True, hide_index=True)
+        
+        # NOUVEAU: Section de modification des saisies depuis le cumul annuel
+        st.markdown("---")
+        st.subheader("✏️ Modifier des saisies depuis le cumul annuel")
+        
+        # Sélection d'un archiviste pour voir ses saisies
+        archivistes_annee = [s['archiviste'] for s in stats_annee]
+        archiviste_selectionne = st.selectbox(
+            "Sélectionner un archiviste pour voir/modifier ses saisies :",
+            options=archivistes_annee,
+            key="archiviste_cumul_annuel"
+        )
+        
+        if archiviste_selectionne:
+            # Récupérer les saisies de cet archiviste pour l'année
+            date_debut_annee = date(annee_selectee, 1, 1)
+            date_fin_annee = date(annee_selectee, 12, 31)
             
-            # Sélection d'un archiviste pour voir ses saisies
-            archivistes_annee = [s['archiviste'] for s in stats_annee]
-            archiviste_selectionne = st.selectbox(
-                "Sélectionner un archiviste pour voir/modifier ses saisies :",
-                options=archivistes_annee,
-                key="archiviste_cumul_annuel"
+            saisies_archiviste = _cached_traitements(
+                db,
+                version,
+                date_debut_annee.isoformat(),
+                date_fin_annee.isoformat(),
+                archiviste_selectionne
             )
             
-            if archiviste_selectionne:
-                # Récupérer les saisies de cet archiviste pour l'année
-                date_debut_annee = date(annee_selectee, 1, 1)
-                date_fin_annee = date(annee_selectee, 12, 31)
+            if saisies_archiviste:
+                st.write(f"**Saisies de {archiviste_selectionne} en {annee_selectee} :**")
                 
-                saisies_archiviste = db.obtenir_traitements_par_archiviste(
-                    archiviste_selectionne,
-                    date_debut_annee.strftime('%Y-%m-%d'),
-                    date_fin_annee.strftime('%Y-%m-%d')
-                )
+                # Afficher les saisies dans un tableau avec possibilité de sélection
+                df_saisies = pd.DataFrame({
+                    "ID": [s['id'] for s in saisies_archiviste],
+                    "Date": [date_fr(s['date_traitement']) for s in saisies_archiviste],
+                    "Dossiers": [s['dossiers_traites'] for s in saisies_archiviste],
+                    "Commentaire": [s['commentaire'] or "" for s in saisies_archiviste]
+                })
+                st.dataframe(df_saisies, use_container_width=True, hide_index=True)
                 
-                if saisies_archiviste:
-                    st.write(f"**Saisies de {archiviste_selectionne} en {annee_selectee} :**")
-                    
-                    # Afficher les saisies dans un tableau avec possibilité de sélection
-                    affichage_saisies = []
-                    for s in saisies_archiviste:
-                        affichage_saisies.append({
-                            "ID": s['id'],
-                            "Date": datetime.strptime(s['date_traitement'], "%Y-%m-%d").strftime("%d/%m/%Y"),
-                            "Dossiers": s['dossiers_traites'],
-                            "Commentaire": s['commentaire'] or ""
-                        })
+                # Sélection d'une saisie à modifier
+                if len(saisies_archiviste) > 0:
+                    # Index et libellés calculés une fois, pas un parcours par option
+                    saisies_par_id = {s['id']: s for s in saisies_archiviste}
+                    libelles = {
+                        sid: f"ID:{sid} - {date_fr(s['date_traitement'])} - {s['dossiers_traites']} dossiers"
+                        for sid, s in saisies_par_id.items()
+                    }
+                    id_saisie_modif = st.selectbox(
+                        "Choisir une saisie à modifier :",
+                        options=list(saisies_par_id),
+                        format_func=libelles.get,
+                        key="id_saisie_modif_cumul"
+                    )
                     
-                    df_saisies = pd.DataFrame(affichage_saisies)
-                    st.dataframe(df_saisies, use_container_width=True)
+                    # Trouver la saisie sélectionnée
+                    saisie_selectionnee = saisies_par_id.get(id_saisie_modif)
                     
-                    # Sélection d'une saisie à modifier
-                    if len(saisies_archiviste) > 0:
-                        ids_saisies = [s['id'] for s in saisies_archiviste]
-                        id_saisie_modif = st.selectbox(
-                            "Choisir une saisie à modifier :",
-                            options=ids_saisies,
-                            format_func=lambda x: f"ID:{x} - {next((datetime.strptime(s['date_traitement'], '%Y-%m-%d').strftime('%d/%m/%Y') for s in saisies_archiviste if s['id'] == x), '')} - {next((s['dossiers_traites'] for s in saisies_archiviste if s['id'] == x), '')} dossiers",
-                            key="id_saisie_modif_cumul"
-                        )
+                    if saisie_selectionnee:
+                        st.markdown("**Modifier cette saisie :**")
                         
-                        # Trouver la saisie sélectionnée
-                        saisie_selectionnee = next((s for s in saisies_archiviste if s['id'] == id_saisie_modif), None)
+                        col_modif1, col_modif2 = st.columns(2)
                         
-                        if saisie_selectionnee:
-                            st.markdown("**Modifier cette saisie :**")
-                            
-                            col_modif1, col_modif2 = st.columns(2)
+                        with col_modif1:
+                            nouvelle_date_cumul = st.date_input(
+                                "Nouvelle date :",
+                                value=date.fromisoformat(saisie_selectionnee['date_traitement']),
+                                key="nouvelle_date_cumul"
+                            )
                             
-                            with col_modif1:
-                                nouvelle_date_cumul = st.date_input(
-                                    "Nouvelle date :",
-                                    value=datetime.strptime(saisie_selectionnee['date_traitement'], "%Y-%m-%d").date(),
-                                    key="nouvelle_date_cumul"
+                            nouveaux_dossiers_cumul = st.number_input(
+                                "Nouveau nombre de dossiers :",
+                                min_value=0,
+                                value=saisie_selectionnee['dossiers_traites'],
+                                step=1,
+                                key="nouveaux_dossiers_cumul"
+                            )
+                        
+                        with col_modif2:
+                            nouveau_commentaire_cumul = st.text_area(
+                                "Nouveau commentaire :",
+                                value=saisie_selectionnee['commentaire'] or "",
+                                height=100,
+                                key="nouveau_commentaire_cumul"
+                            )
+                        
+                        if st.button("✅ Enregistrer les modifications", key="btn_modif_cumul"):
+                            try:
+                                db.modifier_traitement(
+                                    saisie_selectionnee['id'],
+                                    nouvelle_date_cumul.isoformat(),
+                                    saisie_selectionnee['archiviste'],
+                                    nouveaux_dossiers_cumul,
+                                    nouveau_commentaire_cumul
                                 )
                                 
-                                nouveaux_dossiers_cumul = st.number_input(
-                                    "Nouveau nombre de dossiers :",
-                                    min_value=0,
-                                    value=saisie_selectionnee['dossiers_traites'],
-                                    step=1,
-                                    key="nouveaux_dossiers_cumul"
-                                )
-                            
-                            with col_modif2:
-                                nouveau_commentaire_cumul = st.text_area(
-                                    "Nouveau commentaire :",
-                                    value=saisie_selectionnee['commentaire'] or "",
-                                    height=100,
-                                    key="nouveau_commentaire_cumul"
-                                )
-                            
-                            if st.button("✅ Enregistrer les modifications", key="btn_modif_cumul"):
-                                try:
-                                    with sqlite3.connect(db.db_path) as conn:
-                                        cursor = conn.cursor()
-                                        cursor.execute("""
-                                            UPDATE traitements 
-                                            SET date_traitement = ?, dossiers_traites = ?, commentaire = ?
-                                            WHERE id = ?
-                                        """, (
-                                            nouvelle_date_cumul.strftime("%Y-%m-%d"),
-                                            nouveaux_dossiers_cumul,
-                                            nouveau_commentaire_cumul,
-                                            saisie_selectionnee['id']
-                                        ))
-                                        conn.commit()
-                                    
-                                    st.success(f"✅ Saisie ID:{saisie_selectionnee['id']} modifiée avec succès !")
-                                    st.rerun()  # Actualiser la page
-                                    
-                                except Exception as e:
-                                    st.error(f"❌ Erreur lors de la modification : {e}")
-                else:
-                    st.info(f"Aucune saisie trouvée pour {archiviste_selectionne} en {annee_selectee}.")
+                                st.success(f"✅ Saisie ID:{saisie_selectionnee['id']} modifiée avec succès !")
+                                st.rerun(scope="fragment")  # Actualiser l'onglet seulement
+                                
+                            except Exception as e:
+                                st.error(f"❌ Erreur lors de la modification : {e}")
+            else:
+                st.info(f"Aucune saisie trouvée pour {archiviste_selectionne} en {annee_selectee}.")
+        
+        # Option d'export pour les données annuelles
+        if st.button("⬇️ Exporter performances annuelles CSV"):
+            st.download_button(
+                label="Télécharger performances annuelles",
+                data=_cached_csv_annuel(stats_calc, version, annee_selectee),
+                file_name=f"performances_annuelles_{annee_selectee}.csv",
+                mime="text/csv"
+            )
             
-            # Option d'export pour les données annuelles
-            if st.button("⬇️ Exporter performances annuelles CSV"):
-                csv_buffer = StringIO()
-                writer = csv.writer(csv_buffer)
-                writer.writerow([
-                    "Rang", "Archiviste", "Total_dossiers", "Jours_travailles", 
-                    "Moyenne_jour", "Taux_performance", "Seuil_90", "Couverture_annee", "Statut"
-                ])
-                for row in affichage_annee:
-                    writer.writerow([
-                        row["Rang"], row["Archiviste"], 
-                        row["Total dossiers"].replace(" ", ""),
-                        row["Jours travaillés"], row["Moyenne/jour"],
-                        row["% Performance"], row["Seuil (90%)"],
-                        row["% Couverture année"], row["Statut"]
-                    ])
-                
-                st.download_button(
-                    label="Télécharger performances annuelles",
-                    data=csv_buffer.getvalue().encode("utf-8-sig"),
-                    file_name=f"performances_annuelles_{annee_selectee}.csv",
-                    mime="text/csv"
-                )
-                
-        else:
-            st.info(f"Aucune donnée disponible pour l'année {annee_selectee}.")
-
-    # Bouton d'export d'analyse complet existant
-    st.markdown("---")
-    if st.button("⬇️ Exporter Analyse CSV complet"):
-        csv_data = export_analyse(db, stats_calc)
-        st.download_button(
-            label="Télécharger fichier d'analyse",
-            data=csv_data.encode("latin1"),
-            file_name=f"analyse_archives_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-            mime="text/csv"
-        )
+    else:
+        st.info(f"Aucune donnée disponible pour l'année {annee_selectee}.")
 
 def page_parametres(db: DatabaseManager):
     """Page paramètres avec seuil d'objectif"""
     st.header("⚙️ Paramètres de l'application")
-    stock_init = db.obtenir_parametre('stock_initial')
-    obj = db.obtenir_parametre('objectif_journalier')
-    seuil = db.obtenir_parametre('seuil_objectif')
-    pwd = db.obtenir_parametre('mot_de_passe')
-    pwd_app = db.obtenir_parametre('mot_de_passe_app')
+    stock_init = _cached_param(db, 'stock_initial')
+    obj = _cached_param(db, 'objectif_journalier')
+    seuil = _cached_param(db, 'seuil_objectif')
     
     col1, col2 = st.columns(2)
     with col1:
@@ -1464,51 +1872,47 @@ def page_parametres(db: DatabaseManager):
     with col3:
         new_pwd = st.text_input(
             "Mot de passe administration :",
-            value=pwd or "",
-            type="password"
+            value="",
+            type="password",
+            help="Laisser vide pour conserver le mot de passe actuel"
         )
     with col4:
         new_pwd_app = st.text_input(
             "Mot de passe application :",
-            value=pwd_app or "",
-            type="password"
+            value="",
+            type="password",
+            help="Laisser vide pour conserver le mot de passe actuel"
         )
     
     if st.button("✅ Enregistrer les paramètres"):
         if new_stock <= 0 or new_obj <= 0:
             st.error("Le stock initial et l'objectif journalier doivent être strictement positifs.")
-        elif len(new_pwd) < 3 or len(new_pwd_app) < 3:
+        elif (new_pwd and len(new_pwd) < 3) or (new_pwd_app and len(new_pwd_app) < 3):
             st.error("Les mots de passe doivent contenir au moins 3 caractères.")
         else:
             db.mettre_a_jour_parametre('stock_initial', str(new_stock))
             db.mettre_a_jour_parametre('objectif_journalier', str(new_obj))
             db.mettre_a_jour_parametre('seuil_objectif', str(new_seuil))
-            db.mettre_a_jour_parametre('mot_de_passe', new_pwd)
-            db.mettre_a_jour_parametre('mot_de_passe_app', new_pwd_app)
+            if new_pwd:
+                db.definir_mot_de_passe('mot_de_passe', new_pwd)
+                # Les accès vérifiés avec l'ancien mot de passe ne valent plus
+                oublier_acces_admin()
+            if new_pwd_app:
+                db.definir_mot_de_passe('mot_de_passe_app', new_pwd_app)
             st.success("✅ Paramètres mis à jour.")
 
 def page_archivistes(db: DatabaseManager):
+    import pandas as pd
     st.header("👥 Gestion des archivistes CNA")
-    all_arch = db.obtenir_archivistes(actifs_seulement=False)
-    affichage = []
-    for nom, actif in all_arch:
-        with sqlite3.connect(db.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT MAX(date_traitement) FROM traitements WHERE archiviste = ?",
-                (nom,)
-            )
-            last = cursor.fetchone()[0]
-        if last:
-            try:
-                d = datetime.strptime(last, "%Y-%m-%d").strftime("%d/%m/%Y")
-            except:
-                d = "Inconnue"
-        else:
-            d = "Jamais"
-        statut = "✅ Actif" if actif else "❌ Inactif"
-        affichage.append({"Nom": nom, "Statut": statut, "Dernière activité": d})
-    df_arch = pd.DataFrame(affichage)
+    all_arch = _cached_archivistes_activite(db, db.obtenir_version())
+    df_arch = pd.DataFrame({
+        "Nom": [nom for nom, _, _ in all_arch],
+        "Statut": ["✅ Actif" if actif else "❌ Inactif" for _, actif, _ in all_arch],
+        "Dernière activité": [
+            date_fr(derniere) if derniere else "Jamais"
+            for _, _, derniere in all_arch
+        ]
+    })
     st.dataframe(df_arch, use_container_width=True)
 
     st.subheader("➕ Ajouter un nouvel archiviste")
@@ -1540,10 +1944,7 @@ def page_archivistes(db: DatabaseManager):
                 st.success(f"✅ Archiviste {choix_arch} désactivé.")
         else:
             if st.button("Réactiver archiviste"):
-                with sqlite3.connect(db.db_path) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("UPDATE archivistes SET actif = 1 WHERE nom = ?", (choix_arch,))
-                    conn.commit()
+                db.reactiver_archiviste(choix_arch)
                 st.success(f"✅ Archiviste {choix_arch} réactivé.")
     with col2:
         if st.button("Supprimer définitivement"):
@@ -1555,31 +1956,126 @@ def page_archivistes(db: DatabaseManager):
                 except Exception as e:
                     st.error(f"❌ Impossible de supprimer : {e}")
 
+def page_accueil(db: DatabaseManager, stats_calc: StatisticsCalculator, seuil_dossiers):
+    """Page d'accueil : entête, navigation, fonctionnalités et aperçu rapide"""
+    # CSS, entête à dégradé et message de bienvenue en un seul bloc HTML
+    # (st.html évite le passage par le moteur Markdown)
+    st.html(ACCUEIL_ENTETE_HTML)
+    
+    # Navigation avec Streamlit natif - plus fiable
+    st.markdown("### 📋 Navigation Principale")
+    
+    # Créer des colonnes pour un affichage plus structuré
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        **➕ Nouvelle saisie**  
+        📝 Enregistrer, modifier ou supprimer des traitements de dossiers physiques
+        
+        **📊 Vue d'ensemble**  
+        📈 Consulter les KPIs et performances globales (avec seuil 90%)
+        
+        **📋 Détail**  
+        📊 Historique des traitements et performances par archiviste
+        """)
+    
+    with col2:
+        st.markdown("""
+        **⚙️ Paramètres**  
+        🔧 Configurer stock initial, objectifs, seuil & mots de passe
+        
+        **👥 Archivistes**  
+        👨‍💼 Gérer la liste des archivistes du CNA
+        """)
+
+    st.markdown("---")
+
+    # Informations complémentaires avec des cards
+    st.markdown("### 🎯 Fonctionnalités principales")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.info("""
+        **📁 Traitement Physique**
+        
+        • Saisie journalière ou par période
+        • Modification et suppression de saisies
+        • Calcul automatique des jours ouvrés
+        • Suivi en temps réel des dossiers traités
+        """)
+    
+    with col2:
+        st.success("""
+        **📈 Performances**
+        
+        • Objectif : 200 dossiers/jour
+        • Seuil d'atteinte : 180 dossiers (90%)
+        • Analyse hebdomadaire, mensuelle, annuelle
+        • Modification depuis le cumul annuel
+        """)
+    
+    with col3:
+        st.warning("""
+        **🎯 Objectifs**
+        
+        • Suivi des objectifs journaliers
+        • Progression globale avec seuil 90%
+        • Gestion individuelle des saisies
+        • Export des analyses
+        """)
+
+    # Métriques rapides en bas de page
+    afficher_apercu_rapide(db, stats_calc, seuil_dossiers)
+
+    # Sidebar admin
+    sidebar_authentication(db)
+
+@st.fragment
+def afficher_apercu_rapide(db: DatabaseManager, stats_calc: StatisticsCalculator, seuil_dossiers):
+    """Métriques rapides de l'accueil, réexécutées indépendamment du reste de la page"""
+    st.markdown("---")
+    st.markdown("### 📊 Aperçu rapide")
+    
+    # Calculer quelques stats de base pour l'affichage
+    kpis = _cached_kpis(stats_calc, db.obtenir_version())
+    
+    metriques = [
+        ("📦 Stock initial", formater_nombre(kpis['stock_initial'])),
+        ("✅ Dossiers traités", formater_nombre(kpis['dossiers_traites'])),
+        ("📊 Progression", f"{kpis['pourcentage_traite']:.1f}%"),
+        ("🎯 Seuil quotidien", f"{seuil_dossiers} dossiers"),
+    ]
+    for col, (label, valeur) in zip(st.columns(len(metriques)), metriques):
+        col.metric(label=label, value=valeur)
+
 def main():
     st.set_page_config(page_title="CNA – Tableau de Bord Archives", layout="wide")
     
     # Initialiser la base de données
-    db = DatabaseManager()
+    db = get_db()
     
-    # Vérifier l'authentification
-    if not check_authentication(db):
+    # Vérifier l'authentification (formulaire seulement si nécessaire)
+    if not est_authentifie() and not check_authentication(db):
         # L'utilisateur n'est pas encore authentifié, arrêter l'exécution
         return
     
     # Si l'utilisateur est authentifié, continuer avec l'application normale
-    stats_calc = StatisticsCalculator(db)
+    stats_calc = get_stats_calc()
 
     st.sidebar.title("CNA – Menu")
     # Ajouter un bouton de déconnexion
     if st.sidebar.button("🚪 Se déconnecter"):
         st.session_state.authenticated = False
+        oublier_acces_admin()
         st.rerun()
     
     st.sidebar.markdown("---")
     
     # Afficher les paramètres actuels dans la sidebar
-    objectif = int(db.obtenir_parametre('objectif_journalier') or 200)
-    seuil = float(db.obtenir_parametre('seuil_objectif') or 0.9)
+    objectif = int(_cached_param(db, 'objectif_journalier') or 200)
+    seuil = float(_cached_param(db, 'seuil_objectif') or 0.9)
     seuil_dossiers = int(objectif * seuil)
     
     st.sidebar.info(f"""
@@ -1594,152 +2090,7 @@ def main():
     )
 
     if section == "🏠 Accueil":
-        # CSS simplifié pour l'entête
-        st.markdown("""
-        <style>
-        .header-container {
-            background: linear-gradient(135deg, #000000 0%, #2d5016 30%, #ff6b35 70%, #000000 100%);
-            padding: 2rem;
-            border-radius: 10px;
-            margin-bottom: 2rem;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.3);
-            text-align: center;
-        }
-        .header-title {
-            color: white;
-            font-size: 2.5rem;
-            font-weight: bold;
-            margin: 0;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.8);
-        }
-        .header-subtitle {
-            color: #f0f0f0;
-            font-size: 1.2rem;
-            margin: 0.5rem 0 0 0;
-            text-shadow: 1px 1px 2px rgba(0,0,0,0.6);
-        }
-        .welcome-text {
-            font-size: 1.3rem;
-            font-weight: 600;
-            text-align: center;
-            color: #2d5016;
-            margin: 1.5rem 0;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-
-        # Entête principal avec dégradé
-        st.markdown("""
-        <div class="header-container">
-            <h1 class="header-title">🗃️ Centre National des Archives</h1>
-            <p class="header-subtitle">Système de Gestion Documentaire</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-        # Message de bienvenue
-        st.markdown("""
-        <p class="welcome-text">🔥 Bienvenue dans le tableau de gestion du traitement physique 🔥</p>
-        """, unsafe_allow_html=True)
-        
-        # Navigation avec Streamlit natif - plus fiable
-        st.markdown("### 📋 Navigation Principale")
-        
-        # Créer des colonnes pour un affichage plus structuré
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("""
-            **➕ Nouvelle saisie**  
-            📝 Enregistrer, modifier ou supprimer des traitements de dossiers physiques
-            
-            **📊 Vue d'ensemble**  
-            📈 Consulter les KPIs et performances globales (avec seuil 90%)
-            
-            **📋 Détail**  
-            📊 Historique des traitements et performances par archiviste
-            """)
-        
-        with col2:
-            st.markdown("""
-            **⚙️ Paramètres**  
-            🔧 Configurer stock initial, objectifs, seuil & mots de passe
-            
-            **👥 Archivistes**  
-            👨‍💼 Gérer la liste des archivistes du CNA
-            """)
-
-        st.markdown("---")
-
-        # Informations complémentaires avec des cards
-        st.markdown("### 🎯 Fonctionnalités principales")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.info("""
-            **📁 Traitement Physique**
-            
-            • Saisie journalière ou par période
-            • Modification et suppression de saisies
-            • Calcul automatique des jours ouvrés
-            • Suivi en temps réel des dossiers traités
-            """)
-        
-        with col2:
-            st.success("""
-            **📈 Performances**
-            
-            • Objectif : 200 dossiers/jour
-            • Seuil d'atteinte : 180 dossiers (90%)
-            • Analyse hebdomadaire, mensuelle, annuelle
-            • Modification depuis le cumul annuel
-            """)
-        
-        with col3:
-            st.warning("""
-            **🎯 Objectifs**
-            
-            • Suivi des objectifs journaliers
-            • Progression globale avec seuil 90%
-            • Gestion individuelle des saisies
-            • Export des analyses
-            """)
-
-        # Métriques rapides en bas de page
-        st.markdown("---")
-        st.markdown("### 📊 Aperçu rapide")
-        
-        # Calculer quelques stats de base pour l'affichage
-        kpis = stats_calc.calculer_kpis_globaux()
-        
-        metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
-        
-        with metric_col1:
-            st.metric(
-                label="📦 Stock initial", 
-                value=f"{kpis['stock_initial']:,}".replace(",", " ")
-            )
-        
-        with metric_col2:
-            st.metric(
-                label="✅ Dossiers traités", 
-                value=f"{kpis['dossiers_traites']:,}".replace(",", " ")
-            )
-        
-        with metric_col3:
-            st.metric(
-                label="📊 Progression", 
-                value=f"{kpis['pourcentage_traite']:.1f}%"
-            )
-        
-        with metric_col4:
-            st.metric(
-                label="🎯 Seuil quotidien", 
-                value=f"{seuil_dossiers} dossiers"
-            )
-
-        # Sidebar admin
-        sidebar_authentication(db)
+        page_accueil(db, stats_calc, seuil_dossiers)
 
     elif section == "➕ Nouvelle saisie":
         formulaire_saisie(db)
@@ -1751,8 +2102,13 @@ def main():
         afficher_tableaux(db, stats_calc)
 
     elif section == "⚙️ Paramètres":
-        pwd = st.text_input("Entrez le mot de passe admin pour accéder aux paramètres :", type="password")
-        if pwd == db.obtenir_parametre('mot_de_passe'):
+        # Vérifié par le callback à la saisie, pas à chaque rerun de la page
+        pwd = st.text_input(
+            "Entrez le mot de passe admin pour accéder aux paramètres :", type="password",
+            key="pwd_admin_parametres",
+            on_change=verifier_acces_admin, args=(db, "pwd_admin_parametres")
+        )
+        if acces_admin_valide(db, "pwd_admin_parametres", pwd):
             page_parametres(db)
         elif pwd:
             st.error("❌ Mot de passe incorrect.")